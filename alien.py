@@ -1,35 +1,42 @@
 import pygame
-from pygame.sprite import Sprite
-
-class Alien(Sprite):
-    """A class to represent a single alien in the fleet."""
-
-    def __init__(self, ai_game):
-        """Initialize the alien and set its starting position."""
-        super().__init__()
-        self.screen = ai_game.screen
-        self.settings = ai_game.settings # Create a settings parameter so we can access alien's speed in update().
-
-        # Load the alien image and set its rect attribute.
-        self.image = pygame.image.load('images/alien.bmp')
-        self.rect = self.image.get_rect()
-
-        # Start each new alien near the top left of the screen.
-        self.rect.x = self.rect.width # Initially plaace each alien near top-left corner of screen
-        self.rect.y = self.rect.height # Add a space to the left of it thats equal to the alien's width and a space above it equal to its height
-
-        # Store the alien's exact horizontal position.
-        self.x = float(self.rect.x)
-
-    def check_edges(self):
-        """Return True if alien is at edge of screen."""
-        screen_rect = self.screen.get_rect()
-        if self.rect.right >= screen_rect.right or self.rect.left <= 0: # Alien is at right edge if right attribute >= right attribute of screen's rect.
-            return True                                                  # Alien is at left edge if its left attribute <= 0
-
-
-    def update(self):
-        """Move the alien to the right."""
-        self.x += (self.settings.alien_speed * self.settings.fleet_direction)
-        self.rect.x = self.x
 
+class Alien:
+    """A class to represent a single alien in the fleet.
+
+    The alien's position lives in its Fleet's arrays; this is a view onto one
+    slot, so collision code can treat it like a sprite. It holds nothing but
+    the fleet and its slot, in __slots__, so even huge fleets stay small.
+    """
+
+    __slots__ = ('fleet', 'index')
+
+    def __init__(self, fleet, index):
+        """Initialize the view onto the alien in the given slot of fleet."""
+        self.fleet = fleet
+        self.index = index
+
+    @property
+    def image(self):
+        """The image shared by every alien in the fleet."""
+        return self.fleet.image
+
+    @property
+    def x(self):
+        """The alien's exact horizontal position."""
+        return self.fleet.x[self.index]
+
+    @property
+    def rect(self):
+        """A new rect at the alien's current position."""
+        fleet = self.fleet
+        rect = pygame.Rect(0, 0, fleet.width, fleet.height)
+        rect.topleft = (fleet.x[self.index], fleet.y[self.index]) # Assigning rounds the floats the same way as setting rect.x did.
+        return rect
+
+    def kill(self):
+        """Remove the alien from its fleet."""
+        self.fleet.kill(self.index)
+
+    def alive(self):
+        """Return True if the alien hasn't been destroyed."""
+        return bool(self.fleet.alive[self.index])
@@ -1,46 +1,131 @@
 import sys # Use tools in sys module to exit game when player quits.
-from time import sleep
+from time import perf_counter_ns
+_import_start = perf_counter_ns() # For --profile-startup.
 
 import pygame # Contains functionality needed to make the game.
 
 from settings import Settings
 from game_stats import GameStats
-from scoreboard import Scoreboard
+from scoreboard import Scoreboard, HeadlessScoreboard
 from button import Button
 from ship import Ship
-from bullet import Bullet
-from alien import Alien
+from bullet import BulletPool
+from fleet import Fleet
+from particles import ParticleSystem
+import collision
+from assets import images
+from scheduler import FixedStepScheduler
+from timers import TimerService
+from input_sources import LiveInput, ScriptedInput
+from controls import Controls, EVENT_TYPES
+from renderer import RENDERERS
+from viewport import Viewport
+from profiler import NullProfiler, ProfilerOverlay
+from score_store import ScoreStore
+import waves
+import snapshot
+_import_end = perf_counter_ns()
 
 class AlienInvasion:
     """Overall class to manage game assets and behaviour."""
 
-    def __init__(self):
-        """Initialize the game, and create game resources."""
-        pygame.init() # Function that initializes the background settings that Pygame needs to work properly
-
-        self.settings = Settings() 
-        
-        self.screen = pygame.display.set_mode(
-            (self.settings.screen_width, self.settings.screen_height)) # Defines dimensions of game window: 1200 pixels wide / 800 pixels high.
-        pygame.display.set_caption("Alien Invasion")
+    def __init__(self, headless=False, input_source=None, settings=None,
+            profiler=None):
+        """Initialize the game, and create game resources.
+
+        A headless game opens no window, loads no fonts and never draws; it's
+        driven by step() and an input source such as ScriptedInput instead.
+        Pass settings to start from something other than the defaults, and a
+        FrameProfiler to time each phase of the loop.
+        """
+        self.headless = headless
+        self.settings = settings or Settings()
+        self.profiler = profiler or NullProfiler() # The null profiler's sections cost next to nothing.
+        self.screen_rect = pygame.Rect(0, 0,
+            self.settings.screen_width, self.settings.screen_height) # The play area, with or without a window.
+
+        if headless:
+            self.screen = None
+            self.view = Viewport(self.screen_rect.size, self.screen_rect.size) # Nothing is drawn, so nothing is scaled.
+            self.input_source = input_source or ScriptedInput()
+        else:
+            with self.profiler.section('init_display'):
+                # Start only the modules we use; pygame.init() would also start audio and joysticks.
+                pygame.display.init()
+                pygame.font.init()
+                if self.settings.fullscreen:
+                    self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN) # (0, 0) means the display's own resolution.
+                else:
+                    self.screen = pygame.display.set_mode(self.settings.display_size
+                            or self.screen_rect.size) # Defines dimensions of game window: 1200 pixels wide / 800 pixels high by default.
+                # Everything is drawn scaled from the logical screen_rect onto the window.
+                self.view = Viewport(self.screen_rect.size, self.screen.get_size())
+                pygame.display.set_caption("Alien Invasion")
+                # Keep events we never use, like mouse motion, out of the queue.
+                pygame.event.set_blocked(None)
+                pygame.event.set_allowed(EVENT_TYPES)
+            self.input_source = input_source or LiveInput()
+
+        # Load every image once up front, so building a fleet never reads from disk.
+        with self.profiler.section('load_images'):
+            images.preload([self.settings.ship_image, self.settings.alien_image])
+
+        # Number of simulation ticks run so far; scripted input is keyed on it.
+        self.ticks = 0
+        self.first_frame_ns = None # Set once the first frame is presented, for --profile-startup.
 
         # Create an instance to store game statistics.
         #   and create a scoreboard
         self.stats = GameStats(self) # Make the instance after creating the game window but before defining other game elements: such as the ship.
-        self.sb = Scoreboard(self) # Make an instance of Scoreboard
+
+        # Saved high scores. Headless games leave the file alone, so batch runs don't fill it.
+        self.scores = None
+        if not headless and self.settings.score_file:
+            with self.profiler.section('load_scores'):
+                self.scores = ScoreStore(self.settings.score_file, self.settings.top_scores_kept)
+        if headless:
+            self.sb = HeadlessScoreboard(self) # Keeps the high score without rendering it.
+        else:
+            self.sb = Scoreboard(self) # Make an instance of Scoreboard
 
         self.ship = Ship(self)
-        self.bullets = pygame.sprite.Group() # Stores all live bullets so we can manage bullets that have already been fired
-                                             # Will use this group to draw bullets to the screen on each pass through the main loop and to update each bullet's position.
+        self.bullets = BulletPool(self) # Holds a fixed set of bullets, recycled as they're fired and expire.
+                                        # Will use this pool to draw bullets to the screen on each pass through the main loop and to update each bullet's position.
 
-        self.aliens = pygame.sprite.Group() # Create a group to hold the fleet of aliens.
-        self._create_fleet()
+        self.aliens = Fleet(self) # Array-backed store for the fleet of aliens; filled when a game starts.
+        self.particles = ParticleSystem(self) # Explosions when aliens are shot down.
+
+        # Run the simulation at a fixed tick rate, separately from drawing.
+        self.scheduler = FixedStepScheduler(self.settings.tick_rate)
+        self.tick_dt = self.settings.reference_fps / self.settings.tick_rate # Per-frame speeds are multiplied by this each tick.
+
+        # Pauses count down in ticks, so the loop keeps running through them.
+        self.timers = TimerService(self.settings.tick_rate, self.settings.skip_pauses)
 
-        # Make the play button.
-        self.play_button = Button(self, "Play")
+        with self.profiler.section('make_buttons'):
+            # Make the play button.
+            self.play_button = Button(self, "Play")
 
-        # Make difficulty level buttons.
-        self._make_difficulty_buttons()
+            # Make difficulty level buttons.
+            self._make_difficulty_buttons()
+            self.buttons = [self.play_button, self.easy_button,
+                    self.medium_button, self.difficult_button] # Drawn while the game is inactive.
+
+        # The last rewind_ticks ticks, saved for rewind(); None keeps no history.
+        self.history = None
+        if self.settings.rewind_ticks:
+            self.history = snapshot.SnapshotRing(self.settings.rewind_ticks)
+
+        # Look up what each key and click does.
+        self.controls = Controls(self)
+
+        if not headless:
+            self.renderer = RENDERERS[self.settings.render_mode](self)
+
+        # Show the profiler's figures on screen while profiling.
+        self.overlay = None
+        if self.profiler.enabled and not headless:
+            self.overlay = ProfilerOverlay(self)
 
     def _make_difficulty_buttons(self):
         """Make buttons that allow player to select difficulty level."""
@@ -61,66 +146,126 @@ class AlienInvasion:
             self.medium_button.rect.top + 1.5*self.medium_button.rect.height)
         self.difficult_button._update_msg_position()
 
-    def run_game(self):
-        """Start the main loop for the game."""
-        while True:
+        # Each difficulty button and the level it picks, for click handling.
+        self.difficulty_buttons = [(self.easy_button, 'easy'),
+                (self.medium_button, 'medium'), (self.difficult_button, 'difficult')]
+
+    def run_game(self, max_frames=None):
+        """Start the main loop for the game.
+
+        It runs until the player quits, or for max_frames frames if given.
+        """
+        frames = 0
+        try:
+            while max_frames is None or frames < max_frames:
+                frames += 1
+                # Wait out the frame cap, then simulate as many fixed ticks as real time calls for.
+                #   The first frame has nothing to wait for, so it's shown straight away.
+                max_fps = self.settings.max_fps if self.stats.game_active else self.settings.menu_fps
+                ticks = self.scheduler.advance(max_fps if frames > 1 else 0)
+
+                with self.profiler.section('frame'): # Everything but the wait for the frame cap.
+                    self._check_events()
+
+                    for _ in range(ticks):
+                        self._tick()
+
+                    # Draw between the last two ticks so motion stays smooth; nothing moves during a pause.
+                    alpha = self.scheduler.alpha if self.stats.state == 'playing' else 1.0
+                    self._update_screen(alpha)
+                if self.first_frame_ns is None:
+                    self.first_frame_ns = perf_counter_ns() # When the first frame reached the display.
+        finally:
+            # Runs when the player quits, too.
+            self.input_source.close(self)
+            if self.scores:
+                self.scores.close() # Wait for the last scores to reach the disk.
+            self._finish_profiling()
+
+    def _finish_profiling(self):
+        """Print the profiler's percentiles and write its trace file, if profiling."""
+        if not self.profiler.enabled:
+            return
+        print(self.profiler.report())
+        if self.profiler.trace_path:
+            self.profiler.write_trace()
+
+    def step(self, n=1):
+        """Run n ticks as fast as possible without drawing.
+
+        Input comes from the input source, keyed on the tick number. Returns
+        True while a game is still in progress.
+        """
+        for _ in range(n):
             self._check_events()
-
-            if self.stats.game_active:
-                self.ship.update()
-                self._update_bullets()
-                self._update_aliens()
-            
-            self._update_screen()     
+            self._tick()
+        return self.stats.game_active
+
+    def _tick(self):
+        """Run one simulation tick, and save it for rewinding if history is kept."""
+        if self.stats.game_active:
+            self._update_game()
+        self.ticks += 1
+        if self.history is not None:
+            self.history.push(snapshot.save(self))
+
+    def save_state(self):
+        """Return the game's state as one flat bytes buffer, for restore_state().
+
+        Restoring it into this game, or another made with the same settings,
+        takes microseconds, so a bot can try thousands of futures from one state.
+        """
+        return snapshot.save(self)
+
+    def restore_state(self, buffer):
+        """Put the game back into a state from save_state()."""
+        snapshot.restore(self, buffer)
+
+    def rewind(self, ticks=1):
+        """Go back ticks ticks through the saved history, forgetting what came after."""
+        if self.history is None:
+            raise RuntimeError("no history to rewind; set settings.rewind_ticks")
+        snapshot.restore(self, self.history.rewind(ticks))
+
+    def _update_game(self):
+        """Advance the game by one fixed tick."""
+        with self.profiler.section('tick'):
+            self.timers.update()
+            with self.profiler.section('particles'):
+                self.particles.update(self.tick_dt) # Explosions play out through pauses, too.
+            if self.stats.state != 'playing':
+                return # Hold everything still until the pause runs out.
+            self.controls.update() # Auto-fire while the fire key is held.
+            with self.profiler.section('ship'):
+                self.ship.update(self.tick_dt)
+            self._update_bullets()
+            self._update_aliens()
 
 
     def _check_events(self):
         """Respond to keypresses and mouse events."""
-        for event in pygame.event.get(): # Event: action that the user performs while playing the game.
-            if event.type == pygame.QUIT: # When player clicks game window's close button a pygame.QUIT event detected and call sys.exit() to exit the game.
-                sys.exit()
-            elif event.type == pygame.KEYDOWN:
-                self._check_keydown_events(event)
-            elif event.type == pygame.KEYUP:
-                self._check_keyup_events(event)
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos() # Returns a tuple containing mouse cursor's x- and y- coordinates when mouse button is clicked.
-                self._check_play_button(mouse_pos) # Send these values to the method _check_play_button
-                self._check_difficulty_buttons(mouse_pos)
-
-    def _check_play_button(self, mouse_pos):
-        """Start a new game when the player clicks Play."""
-        button_clicked = self.play_button.rect.collidepoint(mouse_pos) # Flag button_clicked stores true/false value
-        if button_clicked and not self.stats.game_active:
-            self.stats.reset_stats()
-            self.stats.game_active = True
-            self.sb.prep_score() # Call this after resetting the game stats when starting a new game
-            self.sb.prep_level() # Ensures level image updates properly at start of a new game when player clicks Play button.
-            self.sb.prep_ships() # Show player how many ships they have to start with
-            self._start_game() # Game restarts only if Play is clicked AND game is not currently active.
-
-    def _check_difficulty_buttons(self, mouse_pos):
-        """Set the appropriate difficulty level."""
-        easy_button_clicked = self.easy_button.rect.collidepoint(mouse_pos)
-        medium_button_clicked = self.medium_button.rect.collidepoint(
-                mouse_pos)
-        diff_button_clicked = self.difficult_button.rect.collidepoint(
-                mouse_pos)
-        if easy_button_clicked:
-            self.settings.difficulty_level = 'easy'
-        elif medium_button_clicked:
-            self.settings.difficulty_level = 'medium'
-        elif diff_button_clicked:
-            self.settings.difficulty_level = 'difficult'
+        with self.profiler.section('events'):
+            self._handle_events(self.input_source.poll(self.ticks))
+
+    def _handle_events(self, events):
+        """Respond to each event in events."""
+        self.controls.handle(events) # Looks up each event's handler instead of testing every case.
 
     def _start_game(self):
         """Start a new game."""
         # Reset the game settings.
         self.settings.initialize_dynamic_settings()
+        self.bullets.resize(self.settings.bullets_allowed) # The difficulty decides how many bullets can be in flight.
 
         # Reset the game statistics.
         self.stats.reset_stats()
         self.stats.game_active = True
+        self.stats.start_tick = self.ticks # So the game's length can be saved with its score.
+        self.timers.clear() # Forget any pause left over from the last game.
+        self.particles.clear()
+        if self.scores:
+            self.stats.high_score = self.scores.best(self.settings.difficulty_level) # Each difficulty has its own high score.
+        self.sb.prep_images() # Render the new score, level and ships left; the first game renders them for the first time.
 
         # Get rid of any remaining aliens and bullets.
         self.aliens.empty()
@@ -132,84 +277,70 @@ class AlienInvasion:
 
        
                 
-    def _check_keydown_events(self, event):
-        """Respond to keypresses."""
-        if event.key == pygame.K_RIGHT:
-            self.ship.moving_right = True
-        elif event.key == pygame.K_LEFT:
-            self.ship.moving_left = True
-        elif event.key == pygame.K_q:
-            sys.exit()
-        elif event.key == pygame.K_SPACE:
-            self._fire_bullet()
-        elif event.key == pygame.K_p and not self.stats.game_active:
-            self._start_game()
-
-    def _check_keyup_events(self, event):
-        """Respond to key releases."""
-        if event.key == pygame.K_RIGHT:
-            self.ship.moving_right = False
-        elif event.key == pygame.K_LEFT:
-            self.ship.moving_left = False
-
-
     def _fire_bullet(self):
-        """Create a new bullet and add it to the bullets group."""
-        if len(self.bullets) < self.settings.bullets_allowed:
-            new_bullet = Bullet(self)
-            self.bullets.add(new_bullet)
+        """Fire a spare bullet from the pool, if there is one."""
+        self.bullets.fire() # The pool holds bullets_allowed bullets, so it does nothing once they're all in flight.
 
 
     def _update_bullets(self):
         """Update position of bullets and get rid of old bullets."""
-        # Update bullet positions.
-        self.bullets.update() # When calling update() on a group, the group automatically calls update() for each sprite in the group.
-                                 # The line calls bullet.update() for each bullet we place in the group bullets.
-
-        # Get rid of bullets that have disappeared.
-        for bullet in self.bullets.copy(): # Can't remove items from a list/group within a for loop, so have to loop over a copy of the group.
-            if bullet.rect.bottom <= 0: # Check each bullet to see whether it has disappeared off top of the screen.
-                 self.bullets.remove(bullet)
+        # Update bullet positions, and return bullets that have disappeared to the pool.
+        with self.profiler.section('bullets'):
+            self.bullets.update(self.tick_dt) # The pool calls bullet.update() for each bullet in flight.
 
-        self._check_bullet_alien_collisions()
+        with self.profiler.section('collision'):
+            self._check_bullet_alien_collisions()
 
 
 
     def _check_bullet_alien_collisions(self): # Any bullet that collides with an alien becomes a key in collisions dic
         """Respond to bullet=alien collisions."""
         # Remove any bullets and aliens that have collided
-        collisions = pygame.sprite.groupcollide(        # Compares positions of all bullets and aliens - identifying any that overlap
-                self.bullets, self.aliens, True, True)  # The two True arguments tell Pygame to delete the bullets and aliens that have collided
+        collisions = collision.groupcollide(            # Compares each bullet with the aliens in nearby grid cells - identifying any that overlap
+                self.bullets, self.aliens, True, True)  # The two True arguments delete the bullets and aliens that have collided
 
         if collisions: # When bullet hits an alien, Pygame returns a collisions dictionary.
             for aliens in collisions.values(): # Value associated with each bullet is a list of aliens it hits.
                 self.stats.score += self.settings.alien_points * len(aliens) # multiply value of each alien by number of aliens in each list and add this amount to the score.
+                for alien in aliens:
+                    self.particles.burst(alien.rect.center) # Blow it up.
             self.sb.prep_score() # Then call prep_score() to create new image for the updated score.
             self.sb.check_high_score() # Checking high score each time an alien is hit after updating the score after all aliens have been hit
 
         if not self.aliens: # Check whether the aliens group is empty.
-            # Destroy existing bullets and create new fleet.
-            self.bullets.empty() # Removes all remaining sprites from a group
-            self._create_fleet()
-            self.settings.increase_speed() # Increased difficulty when all aliens shot down.
+            # Destroy existing bullets, then bring on the next fleet after the level pause.
+            self.bullets.empty() # Returns every bullet in flight to the pool
+            self.stats.state = 'level_transition'
+            self.timers.start('next_level', self.settings.level_pause, self._start_next_level)
 
-            # Increase level.
-            self.stats.level += 1 # When a fleet is destroyed increment this
-            self.sb.prep_level() # Call this to make sure new level displays correctly.
+    def _start_next_level(self):
+        """Move on to the next level and create its new, faster fleet."""
+        # Increase level.
+        self.stats.level += 1 # When a fleet is destroyed increment this
+        self.sb.prep_level() # Call this to make sure new level displays correctly.
+
+        self._create_fleet() # The new level decides the formation.
+        self.settings.increase_speed() # Increased difficulty when all aliens shot down.
+        self.stats.state = 'playing'
 
         
     def _update_aliens(self):
         """Check if the fleet is at an edge, then update the positions of all aliens in the fleet."""
-        self._check_fleet_edges()
-        self.aliens.update()
+        with self.profiler.section('fleet_edges'):
+            self._check_fleet_edges()
+        with self.profiler.section('aliens'):
+            self.aliens.update(self.tick_dt)
 
         # Look for alien-ship collisions.
-        if pygame.sprite.spritecollideany(self.ship, self.aliens): # Takes 2 args: sprite and a group.
-            self._ship_hit()                                       # Loops through the group aliens and returns first alien it finds collided with ship.
-                                                                   # If no collisons occur, the function returns None and if block won't execute.
+        with self.profiler.section('ship_collision'):
+            ship_hit = collision.spritecollideany(self.ship, self.aliens) # Takes 2 args: sprite and the fleet.
+        if ship_hit:              # Returns first alien in the grid cells near the ship that it collided with.
+            self._ship_hit()      # If no collisons occur, the function returns None and if block won't execute.
+            return
         
         # Look for aliens hitting bottom of the screen after updating positions of all aliens and after looking for collisions.
-        self._check_aliens_bottom()
+        with self.profiler.section('fleet_bottom'):
+            self._check_aliens_bottom()
 
     def _ship_hit(self):
         """Respond to the ship being hit by an alien."""
@@ -217,101 +348,147 @@ class AlienInvasion:
             # Decrement ships_left and update scoreboard.
             self.stats.ships_left -= 1
             self.sb.prep_ships() # Call prep_ships after decreasing value of ships_left, so correct number of ships displays each time a ship is destroyed
-            self.aliens.empty()
-        # Get rid of any remaining aliens and bullets.
-            self.bullets.empty()
-        # Create a new fleet and center the ship.
-            self._create_fleet()
-            self.ship.center_ship()
-        # Pause.     
-            sleep(0.5)
+        # Hold the scene still for a moment, while the loop keeps handling events and drawing.
+            self.stats.state = 'respawning'
+            self.timers.start('respawn', self.settings.respawn_pause, self._respawn)
            # self.settings.initialize_dynamic_settings()
         else:
             self.stats.game_active = False
-            pygame.mouse.set_visible(True)
+            if self.scores:
+                self.scores.record_game(self.settings.difficulty_level, self.stats.score,
+                        self.stats.level, self.ticks - self.stats.start_tick) # Queued; the disk write happens on another thread.
+            if not self.headless:
+                pygame.mouse.set_visible(True)
         
 
 
+    def _respawn(self):
+        """Clear the screen, then bring on a new fleet and a centred ship."""
+        # Get rid of any remaining aliens and bullets.
+        self.aliens.empty()
+        self.bullets.empty()
+        # Create a new fleet and center the ship.
+        self._create_fleet()
+        self.ship.center_ship()
+        self.stats.state = 'playing'
+
     def _check_aliens_bottom(self):
         """Check if any aliens have reached the bottom of the screen."""
-        screen_rect = self.screen.get_rect()
-        for alien in self.aliens.sprites():
-            if alien.rect.bottom >= screen_rect.bottom:
-                # Treat this the same as if ship got hit.
-                self._ship_hit()
-                break
+        if self.aliens.reached_bottom(self.screen_rect.bottom):
+            # Treat this the same as if ship got hit.
+            self._ship_hit()
 
     def _create_fleet(self):
-        """Create the fleet of aliens."""
-        # Create an alien and find the number of aliens in a row.
-        # Spacing between each alien is equal to one alien width.
-        alien = Alien(self) # Need to know alien's width and height to place aliens, so we create one here before any calculations.
-                            # This alien won't be part of the fleet, so don't add it to the group aliens.
-        alien_width, alien_height = alien.rect.size # Use the attribute size, which contains a tuple with the width and height of a rect object.
-        available_space_x = self.settings.screen_width - (2 * alien_width) # Calculating horizontal space avaialble for aliens
-        number_aliens_x = available_space_x // (2 * alien_width) # Calcualting number of aliens that can fit in that space
-
-        # Determine the number of rows of aliens that fit on the screen.
-        ship_height = self.ship.rect.height
-        available_space_y = (self.settings.screen_height) - (3 * alien_height) - ship_height
-            # Subtract alien height from top, two alien heights from bottom and ship height from bottom
-        number_rows = available_space_y // (2 * alien_height) # To find number of rows, we divide available space by two times height of an alien.
-
-        # Create the full fleet of aliens.
-        for row_number in range(number_rows): # Counts from 0 to number of rows we want
-            for alien_number in range(number_aliens_x): # Creates the aliens in one row.
-               self._create_alien(alien_number, row_number)
-
-            
-    def _create_alien(self, alien_number, row_number): # Requires number of aliens that's currently being created and row number
-        """Create an alien and place it in the row."""
-        alien = Alien(self) # Create new alien
-        alien_width, alien_height = alien.rect.size
-        alien.x = alien_width + (2 * alien_width) * alien_number # Each alien pushed to right one alien width from left margin.
-                                                                 # Multiply alien width by 2 to account for space one alien takes up, incl empty space to right
-                                                                 # Next, multiply this amount by alien's position in the row.
-        alien.rect.y = alien.rect.height + (2 * alien.rect.height) * row_number # Change alien's y-coorindate value when it's not in the first row
-                                                                                # by starting with one alien's height to create empty space at top of screen.
-        alien.rect.x = alien.x
-        self.aliens.add(alien)
+        """Create the fleet of aliens for the current level."""
+        self.aliens.spawn(*self._fleet_layout())
+
+    def _fleet_layout(self):
+        """Return the (xs, ys) spawn arrays of the current level's formation."""
+        # The waves file names a formation for each level. Its spawn coordinates
+        #   are worked out once for this screen and then reused, so every wave
+        #   after the first only copies two arrays into the fleet.
+        book = waves.load(self.settings.waves_file)
+        return book.layout(book.formation_for(self.stats.level), self.screen_rect.size,
+                (self.aliens.width, self.aliens.height), self.ship.rect.height)
 
     def _check_fleet_edges(self):
         """Respond appropriately if any aliens have reached an edge."""
-        for alien in self.aliens.sprites():
-            if alien.check_edges(): # If true is returned, we know an alien is at the edge and whole fleet needs to change direction.
-                self._change_fleet_direction()
-                break
+        if self.aliens.check_edges(): # If true, an alien is at the edge and whole fleet needs to change direction.
+            self._change_fleet_direction()
 
     def _change_fleet_direction(self):
         """Drop the entire fleet and change the fleet's direction."""
-        for alien in self.aliens.sprites():
-            alien.rect.y += self.settings.fleet_drop_speed # Drop each alien using fleet_drop_speed from settings.
+        self.aliens.drop(self.settings.fleet_drop_speed) # Drop every alien using fleet_drop_speed from settings.
         self.settings.fleet_direction *= -1
 
-    def _update_screen(self):
+    def _update_screen(self, alpha=1.0):
         """Update images on the screen, and flip to the new screen."""
-        self.screen.fill(self.settings.bg_color)
-        self.ship.blitme()
-        for bullet in self.bullets.sprites():
-            bullet.draw_bullet()
-        self.aliens.draw(self.screen)
+        # alpha is how far this frame falls between the last two ticks.
+        with self.profiler.section('draw'):
+            self.renderer.render(self._frame_items(alpha)) # Fills, blits and pushes the frame to the display.
+
+    def _frame_items(self, alpha):
+        """Collect everything to draw, back to front, for the renderer."""
+        items = [self.ship.drawable(alpha)]
+        items += self.bullets.drawables(alpha)
+        items += self.aliens.drawables(alpha)
+        items += self.particles.drawables(alpha) # All the particles, drawn in one pass.
 
         # Draw the score information.
-        self.sb.show_score() # Call show_score() just before we draw the Play button.
+        items += self.sb.drawables() # Add the scores just before the Play button.
 
         # Draw the play button if the game is inactive.
         if not self.stats.game_active:
-            self.play_button.draw_button()
-            self.easy_button.draw_button()
-            self.medium_button.draw_button()
-            self.difficult_button.draw_button()
+            for button in self.buttons:
+                items += button.drawables()
+
+        if self.overlay:
+            items += self.overlay.drawables()
+        return items
 
 
-        pygame.display.flip() # When we move game elements around, pygame.display.flip() continually updates display to show new positions of game elements and hides old ones -> smooth movement
+def window_size(text):
+    """Parse a --window size such as 1920x1080, for argparse."""
+    import argparse # Only the command line needs it, so it stays out of startup.
+    try:
+        width, height = (int(value) for value in text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, like 1920x1080, not {text!r}") from None
+    if width <= 0 or height <= 0:
+        raise argparse.ArgumentTypeError(f"window size must be positive, not {text!r}")
+    return width, height
 
 
 if __name__ == '__main__':
+    import argparse
+    from profiler import FrameProfiler
+
+    parser = argparse.ArgumentParser(description="Play Alien Invasion.")
+    parser.add_argument('--profile', action='store_true',
+            help="time each phase of the frame and show the figures on screen")
+    parser.add_argument('--trace', metavar='FILE',
+            help="also write a Chrome trace of every frame to FILE (implies --profile)")
+    parser.add_argument('--record', metavar='FILE',
+            help="save this session's input to FILE so it can be replayed")
+    parser.add_argument('--replay', metavar='FILE',
+            help="replay a recorded session headless at full speed and report the result")
+    parser.add_argument('--fullscreen', action='store_true',
+            help="fill the display at its own resolution")
+    parser.add_argument('--window', metavar='WIDTHxHEIGHT', type=window_size,
+            help="open a window of this size; the game is scaled to fit")
+    parser.add_argument('--profile-startup', action='store_true',
+            help="time each step up to the first frame, then quit "
+                 "(add python -X importtime for a per-module import breakdown)")
+    args = parser.parse_args()
+
+    if args.replay:
+        from replay import replay
+        result = replay(args.replay)
+        print(result)
+        sys.exit(0 if result.get('matches', True) else 1)
+
+    profiler = None
+    if args.profile or args.trace or args.profile_startup:
+        profiler = FrameProfiler(trace_path=args.trace)
+
+    settings = Settings()
+    settings.fullscreen = args.fullscreen
+    settings.display_size = args.window
+    input_source = None
+    if args.record:
+        from replay import InputRecorder
+        input_source = InputRecorder(LiveInput(), args.record, settings)
+
+    if args.profile_startup:
+        profiler.record('imports', _import_start, _import_end)
+        with profiler.section('startup'):
+            ai = AlienInvasion(settings=settings, profiler=profiler)
+        ai.run_game(max_frames=1) # Prints each section's time on the way out.
+        print(f"time to first frame: {(ai.first_frame_ns - _import_start) / 1e6:.1f} ms")
+        sys.exit()
+
     # Make a game instance, and run the game.
-    ai = AlienInvasion()
+    ai = AlienInvasion(input_source=input_source, settings=settings,
+            profiler=profiler)
     ai.run_game()
 
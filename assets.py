@@ -0,0 +1,106 @@
+import pygame
+
+from viewport import to_pixel
+
+class ImageCache:
+    """A class to load each image once and share it between all sprites."""
+
+    def __init__(self):
+        """Initialize an empty cache and its hit/miss counters."""
+        self._images = {} # Maps (path, alpha) to the loaded surface.
+        self._converted = set() # Keys whose surface already matches the display format.
+        self._masks = {} # Maps (path, colorkey) to the image's collision mask.
+        self._scaled = {} # Maps (path, alpha, scale) to a resized copy for the display.
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, path, alpha=False):
+        """Return the shared surface for path, loading it on first use."""
+        key = (path, alpha)
+        image = self._images.get(key)
+        if image is None:
+            self.misses += 1
+            image = pygame.image.load(path)
+            self._images[key] = image
+        else:
+            self.hits += 1
+
+        # convert() needs a display, so images loaded before set_mode() are
+        #   converted the first time they're asked for after it.
+        if key not in self._converted and pygame.display.get_surface():
+            image = image.convert_alpha() if alpha else image.convert()
+            self._images[key] = image
+            self._converted.add(key)
+        return image
+
+    def scaled(self, path, scale, alpha=False):
+        """Return the image for path resized by scale, resizing it only the first time.
+
+        Called once per display size, so drawing a frame never has to scale.
+        """
+        if scale == 1:
+            return self.load(path, alpha)
+        key = (path, alpha, scale)
+        image = self._scaled.get(key)
+        if image is None:
+            image = self.load(path, alpha)
+            size = (to_pixel(image.get_width() * scale), to_pixel(image.get_height() * scale))
+            image = self._scaled[key] = pygame.transform.smoothscale(image, size)
+        return image
+
+    def mask(self, path, colorkey):
+        """Return the shared collision mask for path: every pixel not of colour colorkey."""
+        key = (path, colorkey)
+        mask = self._masks.get(key)
+        if mask is None:
+            image = self.load(path)
+            mask = pygame.mask.from_threshold(image, colorkey, (1, 1, 1, 255)) # The background pixels...
+            mask.invert() # ...so the sprite is everything else.
+            self._masks[key] = mask
+        return mask
+
+    def preload(self, paths, alpha=False):
+        """Load every image in paths so the first fleet doesn't hit the disk."""
+        for path in paths:
+            if (path, alpha) not in self._images:
+                self.load(path, alpha)
+
+    def stats(self):
+        """Return the cache's hit/miss counts and number of stored images."""
+        return {'hits': self.hits, 'misses': self.misses,
+                'images': len(self._images), 'masks': len(self._masks),
+                'scaled': len(self._scaled)}
+
+    def clear(self):
+        """Drop every cached image and reset the counters."""
+        self._images.clear()
+        self._converted.clear()
+        self._masks.clear()
+        self._scaled.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+class FontCache:
+    """A class to create each font once and share it between everything that draws text."""
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._fonts = {} # Maps (name, size) to the font.
+
+    def load(self, size, name=None):
+        """Return the shared font of the given size; None means pygame's default font."""
+        key = (name, size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = self._fonts[key] = pygame.font.SysFont(name, size)
+        return font
+
+    def clear(self):
+        """Drop every cached font."""
+        self._fonts.clear()
+
+
+# One cache of each kind shared by the whole process.
+images = ImageCache()
+fonts = FontCache()
@@ -0,0 +1,77 @@
+"""Compare pygame's groupcollide with the fleet's broadphase.
+
+Small fleets, like the default 1200x800 one, are tested as one list of
+rects; bigger ones go through the spatial grid. Pixel tests are turned off,
+so both sides do the same rect-only work.
+
+Run from the project folder:  python -m benchmarks.collision
+"""
+import random
+from timeit import repeat
+
+import pygame
+from pygame.sprite import Group, Sprite
+
+from alien_invasion import AlienInvasion
+from settings import Settings
+import collision
+
+SCREEN_SIZES = [(1200, 800), (2400, 1600), (4800, 3200)]
+BULLET_COUNTS = [3, 10, 50] # Medium/difficult, easy (bullets_allowed = 10), stress.
+
+
+def make_game(screen_size, bullet_count):
+    """Make a headless game with a full fleet and bullets scattered through it."""
+    settings = Settings()
+    settings.screen_width, settings.screen_height = screen_size
+    settings.bullets_allowed = bullet_count
+    settings.pixel_collisions = False # pygame's groupcollide only compares rects.
+    ai_game = AlienInvasion(headless=True, settings=settings)
+    ai_game._create_fleet()
+
+    rng = random.Random(1) # Same bullets every run.
+    for _ in range(bullet_count):
+        bullet = ai_game.bullets.fire()
+        bullet.reset((rng.randrange(settings.screen_width),
+                rng.randrange(settings.screen_height // 2)))
+    return ai_game
+
+
+def sprite_fleet(fleet):
+    """Copy the fleet into a Group of plain sprites, the way it used to be stored."""
+    aliens = Group()
+    for view in fleet.sprites():
+        alien = Sprite()
+        alien.image, alien.rect = view.image, view.rect
+        aliens.add(alien)
+    return aliens
+
+
+def best_time(func, number):
+    """Return the seconds per call of func, from the fastest of a few batches."""
+    return min(repeat(func, number=number, repeat=5)) / number
+
+
+def main(number=200):
+    print(f"{'screen':>11} {'aliens':>7} {'bullets':>7} "
+          f"{'groupcollide':>14} {'fleet':>10} {'speedup':>8}")
+    for screen_size in SCREEN_SIZES:
+        for bullet_count in BULLET_COUNTS:
+            ai_game = make_game(screen_size, bullet_count)
+            bullets, fleet = ai_game.bullets, ai_game.aliens
+            aliens = sprite_fleet(fleet)
+
+            # Neither side kills anything, so every repeat sees the same frame.
+            #   The fleet's cached pixel positions are dropped before each
+            #   call, as the fleet moving every tick would.
+            old = best_time(lambda: pygame.sprite.groupcollide(
+                    bullets, aliens, False, False), number)
+            new = best_time(lambda: (fleet._moved(), collision.groupcollide(
+                    bullets, fleet, False, False)), number)
+
+            print(f"{'%dx%d' % screen_size:>11} {len(fleet):>7} {bullet_count:>7} "
+                  f"{old * 1e6:>11.1f} us {new * 1e6:>7.1f} us {old / new:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
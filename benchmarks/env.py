@@ -0,0 +1,36 @@
+"""Measure how many environment steps per second a VectorEnv manages.
+
+Run from the project folder:  python -m benchmarks.env
+"""
+from time import perf_counter
+
+import numpy as np
+
+from env import ACTIONS, VectorEnv
+
+BATCH_SIZES = [1, 8, 32]
+OBSERVATIONS = ['state', 'pixels']
+
+
+def steps_per_second(num_envs, observation, steps=200):
+    """Step a batch with random actions and return game steps per second across it."""
+    env = VectorEnv(num_envs, observation=observation)
+    env.reset()
+    rng = np.random.default_rng(0)
+    actions = rng.integers(len(ACTIONS), size=(steps, num_envs))
+    start = perf_counter()
+    for step_actions in actions:
+        env.step(step_actions)
+    return steps * num_envs / (perf_counter() - start)
+
+
+def main():
+    print(f"{'envs':>5} {'observation':<12} {'steps/s':>10}")
+    for num_envs in BATCH_SIZES:
+        for observation in OBSERVATIONS:
+            rate = steps_per_second(num_envs, observation)
+            print(f"{num_envs:>5} {observation:<12} {rate:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
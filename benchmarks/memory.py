@@ -0,0 +1,139 @@
+"""Measure how much memory each alien, bullet and ship takes.
+
+Run from the project folder:  python -m benchmarks.memory
+
+Sizes come from tracemalloc, so they count everything allocated to build
+the entities: the objects, their rects and any per-entity arrays or lists.
+Each one is shown next to the same entity built the old way, as a
+pygame Sprite with its own rect and float position kept in a Group, so
+the saving can be read straight off the table.
+"""
+import gc
+import tracemalloc
+
+import numpy as np
+import pygame
+from pygame.sprite import Group, Sprite
+
+from alien_invasion import AlienInvasion
+from settings import Settings
+from ship import Ship
+
+COUNTS = [1_000, 10_000, 50_000] # Up to the size of a stress-test fleet.
+
+
+class OldAlien(Sprite):
+    """An alien as it was before the fleet kept its aliens in arrays."""
+
+    def __init__(self, image, x, y):
+        """Place the alien at (x, y), sharing image with the rest of the fleet."""
+        super().__init__()
+        self.image = image
+        self.rect = image.get_rect(topleft=(x, y))
+        self.x = float(self.rect.x)
+        self.y = float(self.rect.y)
+
+
+class OldBullet(Sprite):
+    """A bullet as it was before bullets came from a pool of slotted objects."""
+
+    def __init__(self, ai_game):
+        """Make a bullet at the ship's position."""
+        super().__init__()
+        self.screen = ai_game.screen
+        self.settings = ai_game.settings
+        self.color = self.settings.bullet_color
+        self.rect = pygame.Rect(0, 0, self.settings.bullet_width, self.settings.bullet_height)
+        self.rect.midtop = ai_game.ship.rect.midtop
+        self.y = float(self.rect.y)
+
+
+class OldShip(Sprite):
+    """The ship as it was before it used __slots__."""
+
+    def __init__(self, ai_game):
+        """Make a ship at the bottom centre of the screen, sharing the real ship's image."""
+        super().__init__()
+        self.screen = ai_game.screen
+        self.settings = ai_game.settings
+        self.screen_rect = ai_game.screen_rect.copy() # Each old ship got its own from screen.get_rect().
+        self.image = ai_game.ship.image
+        self.rect = self.image.get_rect()
+        self.rect.midbottom = self.screen_rect.midbottom
+        self.x = float(self.rect.x)
+        self.moving_right = False
+        self.moving_left = False
+
+
+def allocated(build):
+    """Return the bytes still allocated after calling build, and what it returned."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+
+def measure_old(ai_game, count):
+    """Return bytes per alien, per bullet and per ship built the old way, with count of each."""
+    image = ai_game.aliens.image
+    side = int(np.ceil(np.sqrt(count)))
+
+    def build_aliens():
+        aliens = Group()
+        for index in range(count):
+            aliens.add(OldAlien(image, index % side * 2 * image.get_width(),
+                    index // side * 2 * image.get_height()))
+        return aliens
+
+    alien_bytes, _ = allocated(build_aliens)
+    bullet_bytes, _ = allocated(lambda: Group([OldBullet(ai_game) for _ in range(count)]))
+    ship_bytes, _ = allocated(lambda: [OldShip(ai_game) for _ in range(count)])
+    return alien_bytes / count, bullet_bytes / count, ship_bytes / count
+
+
+def measure(ai_game, count):
+    """Return bytes each for count aliens (in all, then arrays and views alone), bullets and ships.
+
+    A spawn makes an Alien view for every slot and groups the slots into
+    rows, on top of filling the arrays. Spawning the same read-only layout
+    again reuses the views and rows, so measuring that second spawn gives
+    the arrays alone.
+    """
+    fleet = ai_game.aliens
+    fleet.empty()
+    side = int(np.ceil(np.sqrt(count)))
+    xs = (np.arange(count) % side) * 2.0 * fleet.width
+    ys = (np.arange(count) // side) * 2.0 * fleet.height
+    xs.setflags(write=False) # Read-only, like waves.py's layouts, so spawn() keeps a template.
+    ys.setflags(write=False)
+    fleet_bytes, _ = allocated(lambda: fleet.spawn(xs, ys)) # Arrays, views and rows.
+    fleet.empty()
+    array_bytes, _ = allocated(lambda: fleet.spawn(xs, ys)) # Arrays only.
+    view_bytes, _ = allocated(lambda: [type(fleet.views[0])(fleet, index)
+            for index in range(count)])
+
+    ai_game.bullets.resize(0)
+    bullet_bytes, _ = allocated(lambda: ai_game.bullets.resize(count))
+    ship_bytes, _ = allocated(lambda: [Ship(ai_game) for _ in range(count)])
+    return (fleet_bytes / count, array_bytes / count, view_bytes / count,
+            bullet_bytes / count, ship_bytes / count)
+
+
+def main():
+    ai_game = AlienInvasion(headless=True, settings=Settings())
+    print("Bytes per entity, old Sprite version -> current version. The current alien")
+    print("is its whole share of a spawned fleet: the fleet's arrays, the Alien view")
+    print("spawn makes for its slot and its part of the row grouping. The arrays and")
+    print("view columns break that down; the rest is the rows.")
+    print(f"{'count':>8} {'alien':>18} {'arrays':>8} {'view':>8} {'bullet':>18} {'ship':>18}")
+    for count in COUNTS:
+        old_alien, old_bullet, old_ship = measure_old(ai_game, count)
+        alien, arrays, view, bullet, ship = measure(ai_game, count)
+        print(f"{count:>8} {old_alien:>8.1f} -> {alien:>6.1f} {arrays:>8.1f} {view:>8.1f} "
+                f"{old_bullet:>8.1f} -> {bullet:>6.1f} {old_ship:>8.1f} -> {ship:>6.1f}")
+
+if __name__ == '__main__':
+    main()
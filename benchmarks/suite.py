@@ -0,0 +1,238 @@
+"""Time the game's main phases across screen sizes, difficulties and fleet densities.
+
+Run from the project folder:
+
+    python -m benchmarks.suite --save baseline.json
+    ...make a change...
+    python -m benchmarks.suite --compare baseline.json
+
+Results are written as JSON. --compare prints each benchmark's change
+against a saved run and exits with status 1 if any got slower than the
+threshold.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+from time import perf_counter
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy') # Render benchmarks need a display, but not a real one.
+
+import numpy as np
+import pygame
+
+from alien_invasion import AlienInvasion
+from settings import Settings
+import collision
+
+SCREEN_SIZES = [(1200, 800), (2400, 1600)]
+DIFFICULTIES = ['easy', 'medium', 'difficult']
+DENSITIES = [1.0, 0.5] # Share of the fleet grid left alive.
+
+
+def make_game(screen_size, difficulty, density, headless=True, render_mode='dirty'):
+    """Make a game that's in progress, with the fleet thinned out to density."""
+    settings = Settings()
+    settings.screen_width, settings.screen_height = screen_size
+    settings.difficulty_level = difficulty
+    settings.render_mode = render_mode
+    settings.score_file = None # Keep benchmark games out of the real high scores.
+    ai_game = AlienInvasion(headless=headless, settings=settings)
+    ai_game._start_game()
+    ai_game.sb.prep_ships()
+
+    # Kill the same aliens every run, so results are comparable.
+    fleet = ai_game.aliens
+    rng = np.random.default_rng(0)
+    doomed = rng.permutation(len(fleet.x))[:int(len(fleet.x) * (1 - density))]
+    for index in doomed.tolist():
+        fleet.kill(index)
+    return ai_game
+
+
+def fill_with_bullets(ai_game):
+    """Fire every bullet allowed and scatter them over the fleet's rows."""
+    rng = np.random.default_rng(1)
+    area = ai_game.screen_rect
+    while ai_game.bullets.fire():
+        pass
+    for bullet in ai_game.bullets.sprites():
+        bullet.reset((int(rng.integers(area.width)), int(rng.integers(area.height // 2))))
+
+
+def measure(func, number, repeat):
+    """Return the seconds per call of func, for each of repeat batches of number calls."""
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        for _ in range(number):
+            func()
+        times.append((perf_counter() - start) / number)
+    return times
+
+
+def bench_create_fleet(ai_game):
+    return ai_game._create_fleet
+
+
+def bench_tick(ai_game):
+    def tick():
+        ai_game._fire_bullet()
+        ai_game._update_aliens()
+        ai_game._update_bullets()
+    return tick
+
+
+def bench_collisions(ai_game):
+    fill_with_bullets(ai_game)
+    # Nothing is killed, so every call sees the same frame.
+    return lambda: collision.groupcollide(ai_game.bullets, ai_game.aliens, False, False)
+
+
+def bench_scoreboard(ai_game):
+    sb, stats = ai_game.sb, ai_game.stats
+    def prep():
+        stats.score += 10 # A new value each time, so the images really are rebuilt.
+        stats.level += 1
+        sb.prep_score()
+        sb.check_high_score()
+        sb.prep_level()
+        sb.prep_ships()
+    return prep
+
+
+def bench_update_screen(ai_game):
+    fill_with_bullets(ai_game)
+    def frame():
+        ai_game._update_game() # Move things, so each frame has something to draw.
+        ai_game._update_screen()
+    return frame
+
+
+def bench_particles(ai_game):
+    particles = ai_game.particles
+    center = ai_game.screen_rect.center
+    def frame():
+        while particles.count < particles.capacity // 2:
+            particles.burst(center) # Keep the budget busy, as in a big chain of kills.
+        particles.update()
+        for source, rect in particles.drawables():
+            source.draw(ai_game.screen)
+    return frame
+
+
+def bench_save_state(ai_game):
+    fill_with_bullets(ai_game)
+    return ai_game.save_state
+
+
+def bench_restore_state(ai_game):
+    fill_with_bullets(ai_game)
+    before = ai_game.save_state()
+    ai_game.aliens.kill(int(ai_game.aliens.alive.argmax())) # One alien apart, so restoring swaps a row image.
+    after = ai_game.save_state()
+    states = [before, after]
+    def restore():
+        states.reverse()
+        ai_game.restore_state(states[0])
+    return restore
+
+
+# name: (setup, needs a window, render mode)
+BENCHMARKS = {
+    'create_fleet': (bench_create_fleet, False, None),
+    'tick': (bench_tick, False, None),
+    'collisions': (bench_collisions, False, None),
+    'scoreboard_prep': (bench_scoreboard, True, None),
+    'update_screen_full': (bench_update_screen, True, 'full'),
+    'update_screen_dirty': (bench_update_screen, True, 'dirty'),
+    'particles': (bench_particles, True, None),
+    'save_state': (bench_save_state, False, None),
+    'restore_state': (bench_restore_state, False, None),
+}
+
+
+def run(number=50, repeat=5, only=None):
+    """Run every benchmark over every parameter combination and return the results."""
+    results = []
+    for screen_size, difficulty, density in itertools.product(
+            SCREEN_SIZES, DIFFICULTIES, DENSITIES):
+        params = {'screen': '%dx%d' % screen_size, 'difficulty': difficulty,
+                  'density': density}
+        for name, (setup, windowed, render_mode) in BENCHMARKS.items():
+            if only and name not in only:
+                continue
+            ai_game = make_game(screen_size, difficulty, density,
+                    headless=not windowed, render_mode=render_mode or 'dirty')
+            times = measure(setup(ai_game), number, repeat)
+            results.append({'name': name, 'params': params,
+                            'median_us': statistics.median(times) * 1e6,
+                            'min_us': min(times) * 1e6,
+                            'number': number, 'repeat': repeat})
+            print(f"{name:<20} {params['screen']:>9} {difficulty:<9} {density:>4} "
+                  f"{results[-1]['median_us']:>10.1f} us", file=sys.stderr)
+    return {'meta': {'python': platform.python_version(),
+                     'pygame': pygame.version.ver, 'numpy': np.__version__,
+                     'machine': platform.machine(), 'system': platform.system()},
+            'results': results}
+
+
+def _key(result):
+    """Identify a result by its benchmark name and parameters."""
+    return (result['name'],) + tuple(sorted(result['params'].items()))
+
+
+def compare(current, baseline, threshold=0.10):
+    """Print each result's change against baseline; return the keys that regressed."""
+    old = {_key(result): result for result in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        before = old.get(_key(result))
+        if before is None:
+            continue
+        change = result['median_us'] / before['median_us'] - 1
+        flag = ''
+        if change > threshold:
+            flag = '  SLOWER'
+            regressions.append(_key(result))
+        elif change < -threshold:
+            flag = '  faster'
+        params = result['params']
+        print(f"{result['name']:<20} {params['screen']:>9} {params['difficulty']:<9} "
+              f"{params['density']:>4} {before['median_us']:>10.1f} -> "
+              f"{result['median_us']:>10.1f} us {change:>+7.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--save', metavar='FILE', help="write the results as JSON to FILE")
+    parser.add_argument('--compare', metavar='FILE', help="compare against results saved in FILE")
+    parser.add_argument('--threshold', type=float, default=0.10,
+            help="slowdown that counts as a regression (default 0.10 = 10%%)")
+    parser.add_argument('--number', type=int, default=50, help="calls per timing batch")
+    parser.add_argument('--repeat', type=int, default=5, help="timing batches per benchmark")
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS),
+            help="run only these benchmarks")
+    args = parser.parse_args()
+
+    results = run(args.number, args.repeat, args.only)
+    if args.save:
+        with open(args.save, 'w') as results_file:
+            json.dump(results, results_file, indent=2)
+    elif not args.compare:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
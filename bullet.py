@@ -1,36 +1,129 @@
 import pygame
-from pygame.sprite import Sprite
 
-class Bullet(Sprite): # When using sprites, you can group related elements in your game and act on all the grouped elements at once.
-    """A class to manage bullets fired from the ship"""
+class Bullet:
+    """A class to manage bullets fired from the ship.
 
-    def __init__(self, ai_game):
+    Bullets live in a BulletPool and are reused rather than recreated, so
+    they're plain objects with __slots__ instead of sprites. The screen and
+    settings are shared through the pool rather than stored on every bullet.
+    """
+
+    __slots__ = ('rect', 'y', 'prev_y', 'pool', 'slot')
+
+    def __init__(self, pool, slot=0):
         """Create a bullet object at the ship's current position."""
-        super().__init__() # To create a bullet instance, __init__() needs the current instance of AlienInvasion and we call super() to inherit properly from Sprite.
-        self.screen = ai_game.screen
-        self.settings = ai_game.settings
-        self.color = self.settings.bullet_color
+        self.pool = pool # The pool the bullet returns to when it's killed.
+        self.slot = slot # Its position in the pool's list.
 
         # Create a bullet rect at (0, 0) and then set the correct position.
-        self.rect = pygame.Rect(0, 0, self.settings.bullet_width,
-            self.settings.bullet_height) # Have to build a rect from scratch using pygame.Rect() class.
+        settings = pool.settings
+        self.rect = pygame.Rect(0, 0, settings.bullet_width,
+            settings.bullet_height) # Have to build a rect from scratch using pygame.Rect() class.
                             # x and y co-ordinates of top-left corner of rect and width and height of rect.
-        self.rect.midtop = ai_game.ship.rect.midtop # Set bullet's midtop attribute to match ship's midtop attribute.
-                                                    # makes the bullet emerge from top of ship.
+        self.reset(pool.ai_game.ship.rect.midtop) # Makes the bullet emerge from top of ship.
 
+    def reset(self, midtop):
+        """Move the bullet to midtop, ready to be fired again."""
+        self.rect.midtop = midtop
         # Store the bullet's position as a decimal value.
         self.y = float(self.rect.y)
+        self.prev_y = self.y
 
-    def update(self):
+    def update(self, dt=1.0):
             """Move the bullet up the screen."""
+            self.prev_y = self.y
             # Update the decimal position of the bullet.
-            self.y -= self.settings.bullet_speed
+            self.y -= self.pool.settings.bullet_speed * dt
             # Update the rect position.
             self.rect.y = self.y
 
+    def kill(self):
+        """Return the bullet to its pool."""
+        self.pool.release(self)
+
+    def draw_bullet(self, alpha=1.0):
+        """Draw the bullet, alpha of the way from its last position to its current one."""
+        self.pool.screen.fill(*self.drawable(alpha))
+
+    def drawable(self, alpha=1.0):
+        """Return the (colour, rect) to draw the bullet with on the display, for a renderer."""
+        rect = self.rect
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        return self.pool.settings.bullet_color, self.pool.view.rect_of(rect.x, y, rect.width, rect.height)
+
+
+class BulletPool:
+    """A class to hold a fixed number of bullets and recycle them.
+
+    The first `active` bullets in the list are in flight; the rest are
+    waiting to be fired. Firing and expiring only move bullets between the
+    two halves of the list, so no objects are created during play.
+    """
+
+    def __init__(self, ai_game):
+        """Preallocate as many bullets as the settings allow."""
+        self.ai_game = ai_game
+        self.screen = ai_game.screen # Shared by every bullet in the pool.
+        self.view = ai_game.view
+        self.settings = ai_game.settings
+        self.bullets = []
+        self.active = 0 # Number of bullets in flight.
+        self.resize(ai_game.settings.bullets_allowed)
+
+    def resize(self, capacity):
+        """Change how many bullets can be in flight at once, and clear them all."""
+        while len(self.bullets) < capacity:
+            self.bullets.append(Bullet(self, len(self.bullets)))
+        del self.bullets[capacity:]
+        self.active = 0
+
+    def fire(self):
+        """Put a spare bullet at the top of the ship and return it, or None if none are spare."""
+        if self.active == len(self.bullets):
+            return None
+        bullet = self.bullets[self.active]
+        bullet.reset(self.ai_game.ship.rect.midtop)
+        self.active += 1
+        return bullet
+
+    def release(self, bullet):
+        """Take bullet out of flight by swapping it with the last bullet in flight."""
+        last = self.active - 1
+        if bullet.slot > last:
+            return # Already spare.
+        other = self.bullets[last]
+        self.bullets[bullet.slot], self.bullets[last] = other, bullet
+        other.slot, bullet.slot = bullet.slot, last
+        self.active = last
+
+    def update(self, dt=1.0):
+        """Move every bullet in flight and recycle those that left the screen."""
+        bullets = self.bullets
+        # Walk backwards, so releasing a bullet only disturbs slots we've already visited.
+        for slot in range(self.active - 1, -1, -1):
+            bullet = bullets[slot]
+            bullet.update(dt)
+            if bullet.rect.bottom <= 0: # Check each bullet to see whether it has disappeared off top of the screen.
+                self.release(bullet)
+
+    def empty(self):
+        """Take every bullet out of flight."""
+        self.active = 0
+
+    def drawables(self, alpha=1.0):
+        """Return what to draw for each bullet in flight, for a renderer."""
+        bullets = self.bullets
+        return [bullets[slot].drawable(alpha) for slot in range(self.active)]
+
+    def sprites(self):
+        """Return a list of the bullets in flight."""
+        return self.bullets[:self.active]
 
-    def draw_bullet(self):
-        """Draw the bullet to the screen."""
-        pygame.draw.rect(self.screen, self.color, self.rect)
+    def __iter__(self):
+        return iter(self.sprites())
 
+    def __len__(self):
+        return self.active
 
+    def __bool__(self):
+        return self.active > 0
@@ -0,0 +1,227 @@
+import math
+
+import numpy as np
+import pygame
+
+class SpatialGrid:
+    """A uniform grid of cells, each listing the aliens whose top-left corner lies in it.
+
+    The grid is a broadphase: a rect is only tested against aliens in the
+    cells it could reach, instead of against the whole fleet. The fleet moves
+    as one rigid block, so rather than rebuilding every tick the grid records
+    the fleet's offset when it was built and shifts queries to match.
+
+    For a fleet of up to brute_force_limit aliens, walking the cells costs
+    more than it saves, so the grid keeps a plain list of the aliens' rects
+    instead and tests the whole list in one Rect.collidelistall() call.
+    """
+
+    brute_force_limit = 150 # Below this many aliens, the list beats the cells.
+
+    def __init__(self, cell_width, cell_height):
+        """Initialize an empty grid with the given cell size."""
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.cells = {}
+        self.rects = None # The aliens' rects, when the fleet is small enough to test them all.
+        self.indices = [] # Slot of the alien behind each rect.
+        self.layout = None # The fleet layout the grid was built from.
+        self.origin = (0.0, 0.0) # The fleet's offset when the grid was built.
+
+    def rebuild(self, lefts, tops, indices, width, height):
+        """Bucket the width x height aliens at (lefts[i], tops[i]) by cell, in one sort."""
+        if len(indices) <= self.brute_force_limit:
+            # One pixel bigger all round, to cover rounding once the fleet has moved.
+            self.cells = {}
+            self.rects = [pygame.Rect(left - 1, top - 1, width + 2, height + 2)
+                    for left, top in zip(lefts.tolist(), tops.tolist())]
+            self.indices = indices.tolist()
+            return
+        self.rects = None
+
+        cols = (lefts // self.cell_width).astype(int)
+        rows = (tops // self.cell_height).astype(int)
+        order = np.lexsort((rows, cols))
+        cols, rows, indices = cols[order], rows[order], indices[order]
+
+        # Split the sorted slots wherever the cell changes.
+        breaks = np.flatnonzero((np.diff(cols) != 0) | (np.diff(rows) != 0)) + 1
+        starts = np.concatenate(([0], breaks)).astype(int)
+        self.cells = {(col, row): slots for col, row, slots in zip(
+                cols[starts].tolist(), rows[starts].tolist(),
+                (chunk.tolist() for chunk in np.split(indices, breaks)))}
+
+    def query(self, left, top, right, bottom, max_width, max_height):
+        """Return the indices of aliens that might overlap the given box."""
+        # An alien up to max_width left of the box (or max_height above it) can still reach into it.
+        first_col = int((left - max_width) // self.cell_width)
+        last_col = int((right - 1) // self.cell_width)
+        first_row = int((top - max_height) // self.cell_height)
+        last_row = int((bottom - 1) // self.cell_height)
+
+        cells = self.cells
+        found = []
+        for col in range(first_col, last_col + 1):
+            for row in range(first_row, last_row + 1):
+                slots = cells.get((col, row))
+                if slots:
+                    found.extend(slots)
+        return found
+
+
+def _fleet_grid(fleet):
+    """Return the fleet's grid, rebuilding it only if the fleet was respawned."""
+    grid = fleet.grid
+    if grid.layout != fleet.layout:
+        alive = np.flatnonzero(fleet.alive)
+        grid.rebuild(fleet.lefts()[alive], fleet.tops()[alive], alive, fleet.width, fleet.height)
+        grid.layout = fleet.layout
+        grid.origin = (fleet.offset_x, fleet.offset_y)
+    return grid
+
+
+def collide_rect(fleet, rect, mask=None):
+    """Return the slots of living aliens that overlap rect (and mask, if pixel tests are on)."""
+    if not fleet:
+        return []
+    return _make_tester(fleet)(rect, mask)
+
+
+_solid_masks = {} # Size -> fully set mask, standing in for plain rects like bullets.
+
+def _solid_mask(size):
+    """Return a shared mask of the given size with every pixel set."""
+    mask = _solid_masks.get(size)
+    if mask is None:
+        mask = _solid_masks[size] = pygame.mask.Mask(size, fill=True)
+    return mask
+
+
+def _make_tester(fleet):
+    """Return a function that finds the living aliens overlapping a rect.
+
+    Everything that doesn't depend on the rect is looked up once here, so
+    testing many bullets against the same fleet stays cheap.
+    """
+    # Move each query back by however far the fleet has moved since the grid
+    #   was built; the extra pixel covers the rounding of each alien's rect.
+    grid = _fleet_grid(fleet)
+    shift_x = fleet.offset_x - grid.origin[0] + 1
+    shift_y = fleet.offset_y - grid.origin[1] + 1
+    width, height = fleet.width, fleet.height
+    # Pixel positions as arrays, computed once a tick for the whole fleet;
+    #   only the few candidates of each query are read out of them.
+    lefts, tops, alive = fleet.lefts(), fleet.tops(), fleet.alive
+    alien_mask = fleet.mask
+
+    # A small fleet's rects are all tested at once, shifted by the whole
+    #   pixels the fleet has moved; their padding covers the rounding.
+    rects, indices = grid.rects, grid.indices
+    move_x = -round(fleet.offset_x - grid.origin[0])
+    move_y = -round(fleet.offset_y - grid.origin[1])
+
+    def test(rect, mask=None):
+        if rects is not None:
+            candidates = rect.move(move_x, move_y).collidelistall(rects)
+            if not candidates:
+                return candidates # Most rects miss everything; skip the rest.
+            candidates = [indices[position] for position in candidates]
+        else:
+            candidates = grid.query(rect.left - shift_x, rect.top - shift_y,
+                    rect.right - shift_x + 2, rect.bottom - shift_y + 2, width, height)
+        if not candidates:
+            return candidates
+
+        # Narrow phase: exact rect overlap, the same test as Rect.colliderect().
+        #   Only a handful of candidates get here, so each one's position is
+        #   read out with item(), which beats indexing with an array for so few.
+        hits = []
+        for index in candidates:
+            if alive.item(index):
+                left, top = lefts.item(index), tops.item(index)
+                if (left < rect.right and rect.left < left + width
+                        and top < rect.bottom and rect.top < top + height):
+                    hits.append((index, left, top))
+
+        # Pixel test, only for the few aliens whose rects overlap: do the
+        #   alien's shape and the other mask (or a solid rect) share a pixel?
+        if hits and alien_mask is not None:
+            mask = mask or _solid_mask(rect.size)
+            hits = [hit for hit in hits if alien_mask.overlap(mask,
+                    (rect.left - int(hit[1]), rect.top - int(hit[2])))]
+        return [index for index, _, _ in hits]
+    return test
+
+
+def swept(rect, dx, dy):
+    """Return the smallest rect covering rect both where it is and moved by (dx, dy)."""
+    return rect.union(rect.move(_outward(dx), _outward(dy)))
+
+
+def _outward(distance):
+    """Round distance away from zero, so a swept rect never falls short."""
+    return math.ceil(distance) if distance > 0 else math.floor(distance)
+
+
+def groupcollide(bullets, fleet, dokill_bullets, dokill_aliens):
+    """Find bullets that hit aliens, like pygame.sprite.groupcollide().
+
+    Returns a dict mapping each bullet that hit something to the list of
+    aliens it hit, so scoring code can stay the same.
+
+    A bullet that moved further this tick than its own height plus an
+    alien's could have jumped clean over an alien, so it's tested along
+    its whole path instead, and hits the first alien it met on the way up.
+    With pixel tests on, an alien's shape can be much thinner than its
+    rect, so any move longer than the bullet itself is swept.
+    At slower speeds the plain overlap test can't miss, and is used as is.
+    """
+    collisions = {}
+    if not fleet or not bullets:
+        return collisions
+    test = _make_tester(fleet)
+    tops = fleet.tops()
+    alien_height = 0 if fleet.mask is not None else fleet.height # How much of an alien a bullet can't skip.
+    in_flight = bullets.bullets
+    # Walk the pool's slots backwards, like BulletPool.update(), so a bullet
+    #   released here only swaps with one that's already been tested.
+    for slot in range(bullets.active - 1, -1, -1):
+        bullet = in_flight[slot]
+        rect = bullet.rect
+        travel = bullet.prev_y - bullet.y # Distance moved up this tick.
+        if travel > rect.height + alien_height:
+            hits = test(swept(rect, 0, travel)) # From where it was down there to where it is now.
+            if len(hits) > 1:
+                first = max(tops.item(index) for index in hits) # The lowest alien is the first one in the way.
+                hits = [index for index in hits if tops.item(index) == first]
+        else:
+            hits = test(rect)
+        if hits:
+            collisions[bullet] = [fleet.views[index] for index in hits]
+            if dokill_aliens:
+                for index in hits:
+                    fleet.kill(index) # Clears its alive flag, which the tester reads.
+            if dokill_bullets:
+                bullet.kill()
+    return collisions
+
+
+def spritecollideany(sprite, fleet):
+    """Return an alien that sprite overlaps, or None, like pygame.sprite.spritecollideany().
+
+    If the fleet's last move (sideways and any drop) was big enough to carry
+    an alien right past the sprite, aliens are tested along that move too.
+    With pixel tests on, thin parts of an alien can pass through in a
+    shorter move, so any move as long as the sprite itself is swept.
+    """
+    rect = sprite.rect
+    mask = getattr(sprite, 'mask', None) # The sprite's shape, for pixel-accurate tests.
+    dx, dy = fleet.last_move
+    alien_width, alien_height = (0, 0) if fleet.mask is not None else (fleet.width, fleet.height)
+    if abs(dx) >= rect.width + alien_width or abs(dy) >= rect.height + alien_height:
+        # An alien that swept across the sprite overlaps it moved back along
+        #   the fleet's path; so grow the sprite's rect forward along it.
+        rect = swept(rect, dx, dy)
+        mask = None # The sprite's shape doesn't cover its path; test the whole swept rect.
+    hits = collide_rect(fleet, rect, mask)
+    return fleet.views[hits[0]] if hits else None
@@ -0,0 +1,170 @@
+import sys
+import warnings
+
+import pygame
+
+# Window events that can leave the screen needing a repaint.
+WINDOW_EVENTS = [pygame.WINDOWEXPOSED, pygame.WINDOWSHOWN, pygame.WINDOWRESTORED,
+        pygame.VIDEOEXPOSE]
+
+# The only event types the game reacts to; everything else is kept out of the queue.
+EVENT_TYPES = [pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN] + WINDOW_EVENTS
+
+
+def key_code(key_name):
+    """Return the pygame key code for a key name such as 'space', 'left' or 'a'.
+
+    Looked up from pygame's K_ constants, since pygame.key.key_code() wants
+    pygame.init() and headless games never call it. Names that aren't a
+    constant, like 'left shift' from pygame.key.name(), fall back to it.
+    """
+    key = getattr(pygame, 'K_' + key_name, None)
+    if key is None:
+        key = getattr(pygame, 'K_' + key_name.upper(), None)
+    if key is None:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore') # Its name table doesn't need pygame.init().
+            try:
+                key = pygame.key.key_code(key_name)
+            except ValueError:
+                raise ValueError(f"unknown key {key_name!r}") from None
+    return key
+
+
+class Controls:
+    """A class to turn input events into game actions through lookup tables.
+
+    settings.key_bindings maps an action name to a key name, such as
+    'fire': 'space', and can be changed with bind(). Each event is handled
+    with a couple of dict lookups instead of a chain of comparisons. Clicks
+    are only tested against the menu buttons while the menu is showing.
+    """
+
+    def __init__(self, ai_game):
+        """Build the dispatch tables from the game's key bindings."""
+        self.ai_game = ai_game
+        self.settings = ai_game.settings
+        self.stats = ai_game.stats
+
+        # Event type -> handler.
+        self.handlers = {
+            pygame.QUIT: self._quit,
+            pygame.KEYDOWN: self._key_down,
+            pygame.KEYUP: self._key_up,
+            pygame.MOUSEBUTTONDOWN: self._click,
+        }
+        for event_type in WINDOW_EVENTS:
+            self.handlers[event_type] = self._exposed
+
+        # Action -> handler, for when its key goes down and when it comes up.
+        self.on_press = {
+            'move_right': self._move_right,
+            'move_left': self._move_left,
+            'fire': self._start_firing,
+            'quit': self._quit,
+            'play': self._play,
+        }
+        self.on_release = {
+            'move_right': self._stop_right,
+            'move_left': self._stop_left,
+            'fire': self._stop_firing,
+        }
+
+        # Key code -> action, built from the settings.
+        self.keymap = {}
+        for action, key_name in self.settings.key_bindings.items():
+            self.bind(action, key_name)
+
+        # Held-fire state, counted in ticks.
+        self.fire_held = False
+        self.fire_countdown = 0
+
+    def bind(self, action, key_name):
+        """Make the key called key_name (e.g. 'space', 'a') trigger action instead of its old key."""
+        if action not in self.on_press:
+            raise ValueError(f"unknown action {action!r}")
+        key = key_code(key_name)
+        for old_key, old_action in list(self.keymap.items()):
+            if old_action == action:
+                del self.keymap[old_key]
+        self.keymap[key] = action
+        self.settings.key_bindings[action] = key_name # Recordings save the settings, bindings included.
+
+    def handle(self, events):
+        """Respond to each event in events."""
+        handlers = self.handlers
+        for event in events:
+            handler = handlers.get(event.type)
+            if handler:
+                handler(event)
+
+    def update(self):
+        """Fire again while the fire key is held, at settings.autofire_rate shots a second."""
+        if not self.fire_held or not self.settings.autofire_rate:
+            return
+        self.fire_countdown -= 1
+        if self.fire_countdown <= 0:
+            self.ai_game._fire_bullet()
+            self._reset_countdown()
+
+    def _key_down(self, event):
+        action = self.keymap.get(event.key)
+        if action:
+            self.on_press[action](event)
+
+    def _key_up(self, event):
+        action = self.keymap.get(event.key)
+        if action in self.on_release:
+            self.on_release[action](event)
+
+    def _click(self, event):
+        """Press whichever menu button was clicked; nothing is clickable during play."""
+        if self.stats.game_active:
+            return
+        ai_game = self.ai_game
+        pos = ai_game.view.to_logical(event.pos) # Buttons are laid out in logical units.
+        if ai_game.play_button.rect.collidepoint(pos):
+            ai_game._start_game()
+            return
+        for button, level in ai_game.difficulty_buttons:
+            if button.rect.collidepoint(pos):
+                self.settings.difficulty_level = level
+                return
+
+    def _exposed(self, event):
+        """Repaint the whole window next frame; what was covered is gone."""
+        renderer = getattr(self.ai_game, 'renderer', None) # Headless games have none.
+        if renderer:
+            renderer.invalidate()
+
+    def _quit(self, event):
+        sys.exit()
+
+    def _play(self, event):
+        if not self.stats.game_active:
+            self.ai_game._start_game()
+
+    def _move_right(self, event):
+        self.ai_game.ship.moving_right = True
+
+    def _move_left(self, event):
+        self.ai_game.ship.moving_left = True
+
+    def _stop_right(self, event):
+        self.ai_game.ship.moving_right = False
+
+    def _stop_left(self, event):
+        self.ai_game.ship.moving_left = False
+
+    def _start_firing(self, event):
+        self.ai_game._fire_bullet()
+        self.fire_held = True
+        self._reset_countdown()
+
+    def _stop_firing(self, event):
+        self.fire_held = False
+
+    def _reset_countdown(self):
+        """Wait one auto-fire interval, in ticks, before the next shot."""
+        rate = self.settings.autofire_rate
+        self.fire_countdown = max(1, round(self.settings.tick_rate / rate)) if rate else 0
@@ -0,0 +1,174 @@
+"""A batched, Gym-style environment for training agents on Alien Invasion.
+
+    env = VectorEnv(16)
+    obs = env.reset()
+    while True:
+        obs, rewards, dones, infos = env.step(policy(obs))
+
+Every game in the batch is a headless AlienInvasion in this process, so
+none of them needs a window.
+"""
+import numpy as np
+import pygame
+
+from alien_invasion import AlienInvasion
+from settings import Settings
+
+# What each action does: (move left, move right, fire).
+ACTIONS = [
+    (False, False, False), # 0: do nothing
+    (True, False, False),  # 1: move left
+    (False, True, False),  # 2: move right
+    (False, False, True),  # 3: fire
+    (True, False, True),   # 4: move left and fire
+    (False, True, True),   # 5: move right and fire
+]
+
+# Grey levels in pixel observations.
+SHIP_SHADE, ALIEN_SHADE, BULLET_SHADE = 255, 128, 200
+
+
+class VectorEnv:
+    """A class to step a batch of games together and return their observations as arrays.
+
+    With observation='state', each game is one row of a float32 array:
+        [ship x, then (x, y) for each of max_bullets bullets, then (x, y)
+         for each of max_aliens alien slots]
+    with positions scaled to 0..1 by the screen size and -1 for empty
+    slots. With observation='pixels', it's a (height, width) uint8 frame,
+    scale times smaller than the screen, drawn with plain rectangles. The
+    frames are a view straight onto the pixels they're drawn in, with no
+    copy, so they're only valid until the next step().
+
+    Each step() applies one action per game and runs frame_skip ticks. The
+    reward is the score gained. A game that ends is reset straight away;
+    its info holds the final score and level.
+    """
+
+    def __init__(self, num_envs, settings=None, observation='state', frame_skip=4,
+            max_aliens=None, scale=8, difficulty_level=None):
+        """Make num_envs headless games; settings are copied into each one."""
+        if observation not in ('state', 'pixels'):
+            raise ValueError(f"unknown observation {observation!r}")
+        self.num_envs = num_envs
+        self.observation = observation
+        self.frame_skip = frame_skip
+
+        self.games = []
+        for _ in range(num_envs):
+            game_settings = Settings()
+            if settings:
+                vars(game_settings).update(vars(settings))
+            if difficulty_level:
+                game_settings.difficulty_level = difficulty_level
+            game_settings.initialize_dynamic_settings() # So the bullet pool starts at the right size.
+            game_settings.skip_pauses = True # An agent has nothing to wait for.
+            self.games.append(AlienInvasion(headless=True, settings=game_settings))
+
+        game = self.games[0]
+        self.width, self.height = game.screen_rect.size
+        self.max_bullets = game.settings.bullets_allowed
+        if max_aliens is None:
+            game._create_fleet() # The first wave, to size the alien slots.
+            max_aliens = len(game.aliens.x)
+        self.max_aliens = max_aliens
+        self.scores = np.zeros(num_envs, dtype=np.int64) # Score at the last step, for rewards.
+
+        if observation == 'state':
+            self.obs = np.empty((num_envs, 1 + 2 * self.max_bullets + 2 * self.max_aliens),
+                    dtype=np.float32)
+        else:
+            # One 8-bit surface holds every game's frame, stacked top to bottom;
+            #   the observation array is a view onto its pixels.
+            self.scale = scale
+            self.frame_width = self.width // scale
+            self.frame_height = self.height // scale
+            self.frames = pygame.Surface((self.frame_width, self.frame_height * num_envs), depth=8)
+            self.frames.set_palette([(shade, shade, shade) for shade in range(256)])
+            pixels = pygame.surfarray.pixels2d(self.frames) # (width, height), no copy.
+            self.obs = pixels.reshape(self.frame_width, num_envs,
+                    self.frame_height).transpose(1, 2, 0)
+
+    def reset(self):
+        """Start a new game in every slot and return the observations."""
+        for game in self.games:
+            game._start_game()
+        self.scores[:] = 0
+        return self._observe()
+
+    def step(self, actions):
+        """Apply one action per game, run frame_skip ticks, and return (obs, rewards, dones, infos)."""
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        dones = np.zeros(self.num_envs, dtype=bool)
+        infos = [{} for _ in range(self.num_envs)]
+        for index, (game, action) in enumerate(zip(self.games, actions)):
+            left, right, fire = ACTIONS[action]
+            game.ship.moving_left = left
+            game.ship.moving_right = right
+            if fire:
+                game._fire_bullet()
+            game.step(self.frame_skip)
+
+            score = game.stats.score
+            rewards[index] = score - self.scores[index]
+            self.scores[index] = score
+            if not game.stats.game_active:
+                dones[index] = True
+                infos[index] = {'score': score, 'level': game.stats.level}
+                game._start_game()
+                self.scores[index] = 0
+        return self._observe(), rewards, dones, infos
+
+    def _observe(self):
+        """Fill in the observation array for every game and return it."""
+        if self.observation == 'state':
+            for index, game in enumerate(self.games):
+                self._fill_state(self.obs[index], game)
+        else:
+            for index, game in enumerate(self.games):
+                self._draw_frame(index, game)
+        return self.obs
+
+    def _fill_state(self, row, game):
+        """Write one game's positions into its row of the state array."""
+        row.fill(-1.0)
+        row[0] = game.ship.x / self.width
+
+        bullets = game.bullets.sprites()[:self.max_bullets]
+        for slot, bullet in enumerate(bullets):
+            row[1 + 2 * slot] = bullet.rect.x / self.width
+            row[2 + 2 * slot] = bullet.y / self.height
+
+        fleet = game.aliens
+        count = min(len(fleet.x), self.max_aliens)
+        start = 1 + 2 * self.max_bullets
+        alive = fleet.alive[:count]
+        aliens = row[start:start + 2 * count].reshape(count, 2)
+        aliens[alive, 0] = fleet.x[:count][alive] / self.width
+        aliens[alive, 1] = fleet.y[:count][alive] / self.height
+
+    def _draw_frame(self, index, game):
+        """Draw one game, shrunk by scale, into its band of the frames surface."""
+        scale, top = self.scale, index * self.frame_height
+        frames = self.frames
+        frames.fill(0, (0, top, self.frame_width, self.frame_height))
+        clip = frames.get_clip()
+        frames.set_clip((0, top, self.frame_width, self.frame_height)) # Keep each game inside its own band.
+
+        fleet = game.aliens
+        width = max(1, fleet.width // scale)
+        height = max(1, fleet.height // scale)
+        lefts = (fleet.lefts()[fleet.alive] // scale).astype(int).tolist()
+        tops = (fleet.tops()[fleet.alive] // scale + top).astype(int).tolist()
+        for x, y in zip(lefts, tops):
+            frames.fill(ALIEN_SHADE, (x, y, width, height))
+
+        for bullet in game.bullets.sprites():
+            rect = bullet.rect
+            frames.fill(BULLET_SHADE, (rect.x // scale, rect.y // scale + top,
+                    max(1, rect.width // scale), max(1, rect.height // scale)))
+
+        rect = game.ship.rect
+        frames.fill(SHIP_SHADE, (rect.x // scale, rect.y // scale + top,
+                max(1, rect.width // scale), max(1, rect.height // scale)))
+        frames.set_clip(clip)
@@ -0,0 +1,240 @@
+import numpy as np
+import pygame
+
+from alien import Alien
+from assets import images
+from collision import SpatialGrid
+
+def to_pixels(values):
+    """Round float positions the way pygame.Rect does (halves away from zero)."""
+    return np.trunc(values + np.copysign(0.5, values))
+
+
+def _frozen(values):
+    """Return True if values is a read-only NumPy array, like the ones waves.py hands out."""
+    return isinstance(values, np.ndarray) and not values.flags.writeable
+
+
+ROW_KEY = (255, 0, 255) # Colorkey for the gaps in a row image; the alien image never uses it.
+
+
+class Fleet:
+    """A class to store the alien fleet as arrays and move it all at once.
+
+    Each alien is one slot in the x/y/alive columns. Movement, edge checks,
+    the fleet drop and the bottom check are single array operations, so
+    their cost barely grows with the size of the fleet. Alien objects are
+    thin views onto a slot, for pygame's collision functions.
+
+    The fleet also moves as one rigid block, so it's drawn a row at a time:
+    each row of aliens is composed into one image, which only has to be
+    rebuilt when one of its aliens is destroyed.
+    """
+
+    def __init__(self, ai_game):
+        """Initialize an empty fleet."""
+        self.settings = ai_game.settings
+        self.screen_rect = ai_game.screen_rect
+        self.view = ai_game.view # Rows are drawn straight at display size.
+
+        # Every alien shares one image, so they all have the same size.
+        self.image = images.load(self.settings.alien_image)
+        self.width, self.height = self.image.get_size()
+        self.display_image = images.scaled(self.settings.alien_image, self.view.scale)
+        # One mask, shared by every alien, for pixel-accurate hits (None tests rects only).
+        self.mask = None
+        if self.settings.pixel_collisions:
+            self.mask = images.mask(self.settings.alien_image, self.settings.image_colorkey)
+
+        # Broadphase index for collisions, about one alien per cell.
+        self.grid = SpatialGrid(2 * self.width, 2 * self.height)
+        self.layout = 0 # Bumped whenever a new fleet is spawned.
+
+        # The read-only coordinate arrays of the last spawn, with the views and
+        #   rows built for them, so spawning the same layout again skips that work.
+        self._template = None
+
+        self.empty()
+
+    def spawn(self, xs, ys):
+        """Replace the fleet with one alien at each (xs[i], ys[i])."""
+        self.x = np.array(xs, dtype=float)
+        self.y = np.array(ys, dtype=float)
+        self.alive = np.ones(len(self.x), dtype=bool)
+        self.count = len(self.x) # Number of aliens still alive.
+
+        # Where the last tick left each alien, for interpolated drawing.
+        self.prev_x = self.x.copy()
+        self.prev_y = self.y.copy()
+
+        self.source = (xs, ys) # What the fleet was spawned from, so restore() can tell if it still matches.
+        template = self._template
+        if template and template[0] is xs and template[1] is ys:
+            self.views, self.row_of, self.rows = template[2:]
+        else:
+            self._build_rows()
+            if _frozen(xs) and _frozen(ys): # Only arrays that can't change are safe to recognise again.
+                self._template = (xs, ys, self.views, self.row_of, self.rows)
+        self.row_alive = np.bincount(self.row_of, minlength=len(self.rows))
+        self.row_images = [None] * len(self.rows) # (image, left of image from anchor), built when first drawn.
+
+        # How far the fleet has moved as a whole since it was spawned.
+        self.offset_x = self.offset_y = 0.0
+        self.last_move = (0.0, 0.0) # The whole move made in the last tick, drop included, for swept collisions.
+        self._dropped = 0.0 # Drop so far this tick.
+        self.layout += 1
+        self._moved()
+
+    def _build_rows(self):
+        """Make a view per alien and group the aliens into rows."""
+        self.views = [Alien(self, index) for index in range(len(self.x))]
+
+        # Group the aliens into rows by their starting height, each ordered left
+        #   to right. A row is drawn where its first alien (the anchor) is, and
+        #   every other alien keeps its starting distance from the anchor.
+        row_ys, self.row_of = np.unique(self.y, return_inverse=True)
+        self.rows = [] # (slots, pixel distances from the anchor) per row.
+        lefts = to_pixels(self.x)
+        for row in range(len(row_ys)):
+            slots = np.flatnonzero(self.row_of == row)
+            slots = slots[np.argsort(self.x[slots], kind='stable')]
+            self.rows.append((slots, (lefts[slots] - lefts[slots[0]]).astype(int)))
+
+    def empty(self):
+        """Remove every alien."""
+        self.spawn((), ())
+
+    def restore(self, xs, ys, x, y, prev_x, prev_y, alive, offset_x, offset_y, last_move, dropped):
+        """Put back a saved state of the fleet spawned from (xs, ys).
+
+        If the fleet is already spawned from xs and ys, only the columns are
+        copied, and only the rows whose aliens changed are redrawn.
+        """
+        if self.source[0] is not xs or self.source[1] is not ys:
+            self.spawn(xs, ys)
+        np.copyto(self.x, x)
+        np.copyto(self.y, y)
+        np.copyto(self.prev_x, prev_x)
+        np.copyto(self.prev_y, prev_y)
+
+        changed = self.alive != alive
+        if changed.any():
+            if np.any(alive & changed):
+                self.layout += 1 # The collision grid only lists aliens alive when it was built.
+            for row in np.unique(self.row_of[changed]).tolist():
+                self.row_images[row] = None
+            np.copyto(self.alive, alive)
+            self.count = int(np.count_nonzero(alive))
+            self.row_alive = np.bincount(self.row_of[self.alive], minlength=len(self.rows))
+
+        self.offset_x, self.offset_y = offset_x, offset_y
+        self.last_move = last_move
+        self._dropped = dropped
+        self._moved()
+
+    def update(self, dt=1.0):
+        """Move the whole fleet sideways."""
+        np.copyto(self.prev_x, self.x)
+        np.copyto(self.prev_y, self.y)
+        step = self.settings.alien_speed * self.settings.fleet_direction * dt
+        self.x += step
+        self.offset_x += step
+        self.last_move = (step, self._dropped)
+        self._dropped = 0.0
+        self._moved()
+
+    def _moved(self):
+        """Note that aliens moved, so cached pixel positions are stale."""
+        self._lefts = self._tops = None
+
+    def lefts(self):
+        """Return each alien's rect.left, as an array."""
+        if self._lefts is None:
+            self._lefts = to_pixels(self.x)
+        return self._lefts
+
+    def tops(self):
+        """Return each alien's rect.top, as an array."""
+        if self._tops is None:
+            self._tops = to_pixels(self.y)
+        return self._tops
+
+    def check_edges(self):
+        """Return True if any living alien is at an edge of the screen."""
+        left = self.lefts()
+        at_edge = (left + self.width >= self.screen_rect.right) | (left <= 0)
+        return bool(np.any(at_edge & self.alive))
+
+    def drop(self, distance):
+        """Move the whole fleet down by distance."""
+        self.y += distance
+        self.offset_y += distance
+        self._dropped += distance
+        self._moved()
+
+    def reached_bottom(self, bottom):
+        """Return True if any living alien has reached the given y-coordinate."""
+        return bool(np.any((self.tops() + self.height >= bottom) & self.alive))
+
+    def kill(self, index):
+        """Destroy the alien in the given slot."""
+        if self.alive[index]:
+            self.alive[index] = False
+            self.count -= 1
+            row = self.row_of[index]
+            self.row_alive[row] -= 1
+            self.row_images[row] = None # Rebuild this row's image without the alien.
+
+    def sprites(self):
+        """Return a list of views onto the living aliens."""
+        return [self.views[index] for index in np.flatnonzero(self.alive)]
+
+    def remove(self, *aliens):
+        """Destroy the given aliens, like Group.remove()."""
+        for alien in aliens:
+            self.kill(alien.index)
+
+    def draw(self, surface, alpha=1.0):
+        """Draw the living aliens, alpha of the way from their last positions."""
+        surface.blits(self.drawables(alpha), False)
+
+    def drawables(self, alpha=1.0):
+        """Return an (image, rect) pair per row with living aliens on the display, for a renderer."""
+        if not self.count:
+            return []
+        view = self.view
+        anchors = [slots[0] for slots, _ in self.rows]
+        prev_x, prev_y = self.prev_x[anchors], self.prev_y[anchors]
+        xs = (to_pixels((prev_x + (self.x[anchors] - prev_x) * alpha) * view.scale) + view.left).tolist()
+        ys = (to_pixels((prev_y + (self.y[anchors] - prev_y) * alpha) * view.scale) + view.top).tolist()
+
+        items = []
+        for row, (x, y) in enumerate(zip(xs, ys)):
+            if not self.row_alive[row]:
+                continue
+            if self.row_images[row] is None:
+                self.row_images[row] = self._compose_row(row)
+            image, left = self.row_images[row]
+            items.append((image, (x + left, y) + image.get_size()))
+        return items
+
+    def _compose_row(self, row):
+        """Draw a row's living aliens onto one display-sized image; return it and its left edge."""
+        slots, offsets = self.rows[row]
+        offsets = to_pixels(offsets[self.alive[slots]] * self.view.scale).astype(int).tolist()
+        left = offsets[0]
+        width, height = self.display_image.get_size()
+        image = pygame.Surface((offsets[-1] - left + width, height))
+        image.fill(ROW_KEY)
+        image.set_colorkey(ROW_KEY, pygame.RLEACCEL) # Let whatever is behind show through the gaps.
+        image.blits([(self.display_image, (offset - left, 0)) for offset in offsets], False)
+        return image, left
+
+    def __iter__(self):
+        return iter(self.sprites())
+
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return self.count > 0
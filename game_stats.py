@@ -16,3 +16,5 @@ class GameStats:
         self.ships_left = self.settings.ship_limit # Resetting some stats each time a player starts a new game
         self.score = 0 # Resetting score each time a new game starts
         self.level = 1
+        self.state = 'playing' # Or 'respawning' / 'level_transition' while a pause counts down.
+        self.start_tick = 0 # Tick the game started on; set by AlienInvasion._start_game().
@@ -0,0 +1,60 @@
+import pygame
+
+class LiveInput:
+    """A class to read the player's input from the pygame event queue."""
+
+    def poll(self, tick):
+        """Return the events that arrived since the last poll."""
+        return pygame.event.get()
+
+    def close(self, ai_game):
+        """Nothing to clean up."""
+
+
+class ScriptedInput:
+    """A class to feed the game a prepared list of events instead of a player."""
+
+    def __init__(self, events_by_tick=None):
+        """Store the script: a dict mapping a tick number to a list of events."""
+        self.events_by_tick = events_by_tick or {}
+
+    def add(self, tick, *events):
+        """Schedule events to arrive just before the given tick is simulated."""
+        self.events_by_tick.setdefault(tick, []).extend(events)
+
+    def poll(self, tick):
+        """Return the events scheduled for this tick."""
+        return self.events_by_tick.get(tick, ())
+
+    def close(self, ai_game):
+        """Nothing to clean up."""
+
+
+class PolicyInput:
+    """A class to let a function decide each tick's input, e.g. a bot."""
+
+    def __init__(self, policy):
+        """Store the policy: a function taking the tick and returning events."""
+        self.policy = policy
+
+    def poll(self, tick):
+        """Ask the policy for this tick's events."""
+        return self.policy(tick) or ()
+
+    def close(self, ai_game):
+        """Nothing to clean up."""
+
+
+def key_down(key):
+    """Make a KEYDOWN event for key, e.g. pygame.K_SPACE."""
+    return pygame.event.Event(pygame.KEYDOWN, key=key)
+
+
+def key_up(key):
+    """Make a KEYUP event for key."""
+    return pygame.event.Event(pygame.KEYUP, key=key)
+
+
+def click(pos):
+    """Make a left mouse click at pos."""
+    return pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1)
@@ -0,0 +1,129 @@
+import numpy as np
+import pygame
+
+class ParticleSystem:
+    """A class to run explosion particles out of fixed-size arrays.
+
+    Every particle is one slot in preallocated position, velocity and age
+    arrays, with the live ones packed at the front. Moving, ageing and
+    removing them are a few array operations per tick, however many there
+    are, and drawing writes them all into the screen's pixels in one go.
+
+    max_particles caps the cost. As the arrays fill up, new bursts get
+    fewer particles, and once they're full new bursts are skipped, so a
+    whole row dying at once thins out the effect instead of the frame rate.
+    """
+
+    def __init__(self, ai_game):
+        """Preallocate room for settings.max_particles particles."""
+        self.settings = ai_game.settings
+        self.screen = ai_game.screen
+        self.view = ai_game.view
+        # A headless game never draws, so it gets no particles at all.
+        self.capacity = 0 if ai_game.headless else self.settings.max_particles
+        self.rng = np.random.default_rng()
+
+        capacity = self.capacity
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.age = np.zeros(capacity, dtype=np.float32) # Seconds since the burst.
+        self.prev_x = np.zeros(capacity, dtype=np.float32) # Last tick's positions, for interpolated drawing.
+        self.prev_y = np.zeros(capacity, dtype=np.float32)
+        self.count = 0 # Live particles, in slots [0, count).
+        self.skipped = 0 # Particles left out to stay in budget, for tuning max_particles.
+
+    def burst(self, center, number=None):
+        """Spray up to number particles (default settings.particles_per_kill) out of center."""
+        if number is None:
+            number = self.settings.particles_per_kill
+        free = self.capacity - self.count
+        if not free:
+            self.skipped += number
+            return
+        wanted = number
+        if free < self.capacity / 2:
+            # Over half full: shrink bursts in step with the room left.
+            number = number * free * 2 // self.capacity
+        number = min(number, free) # Never more than fits, however small the budget.
+        self.skipped += wanted - number
+        if number <= 0:
+            return
+
+        start, end = self.count, self.count + number
+        angles = self.rng.uniform(0, 2 * np.pi, number)
+        speeds = self.rng.uniform(0.2, 1.0, number) * self.settings.particle_speed
+        self.x[start:end] = self.prev_x[start:end] = center[0]
+        self.y[start:end] = self.prev_y[start:end] = center[1]
+        self.vx[start:end] = np.cos(angles) * speeds
+        self.vy[start:end] = np.sin(angles) * speeds
+        self.age[start:end] = 0
+        self.count = end
+
+    def update(self, dt=1.0):
+        """Move and age every particle, then drop the ones that have burnt out."""
+        count = self.count
+        if not count:
+            return
+        x, y = self.x[:count], self.y[:count]
+        self.prev_x[:count] = x
+        self.prev_y[:count] = y
+        x += self.vx[:count] * dt
+        y += self.vy[:count] * dt
+        self.vy[:count] += self.settings.particle_gravity * dt
+        age = self.age[:count]
+        age += dt / self.settings.reference_fps # dt is in frames at the reference rate.
+
+        # Pack the survivors at the front, keeping their order.
+        alive = age < self.settings.particle_life
+        survivors = int(alive.sum())
+        if survivors < count:
+            for values in (self.x, self.y, self.vx, self.vy, self.age, self.prev_x, self.prev_y):
+                values[:survivors] = values[:count][alive]
+            self.count = survivors
+
+    def clear(self):
+        """Remove every particle."""
+        self.count = 0
+
+    def drawables(self, alpha=1.0):
+        """Return one (batch, rect) item that draws every particle on the display, for a renderer."""
+        if not self.count:
+            return []
+        count, view = self.count, self.view
+        xs = self.prev_x[:count] + (self.x[:count] - self.prev_x[:count]) * alpha
+        ys = self.prev_y[:count] + (self.y[:count] - self.prev_y[:count]) * alpha
+        size = view.length(self.settings.particle_size)
+        area = view.rect
+        xs = np.clip((xs * view.scale).astype(int) + area.left, area.left, area.right - size)
+        ys = np.clip((ys * view.scale).astype(int) + area.top, area.top, area.bottom - size)
+        left, top = int(xs.min()), int(ys.min())
+        batch = ParticleBatch(xs, ys, self.settings.particle_color, size)
+        return [(batch, (left, top, int(xs.max()) - left + size, int(ys.max()) - top + size))]
+
+
+class ParticleBatch:
+    """One frame's particles, drawn by a renderer in a single pass.
+
+    A new batch is made every frame, so a renderer that skips unchanged
+    items never mistakes it for last frame's.
+    """
+
+    __slots__ = ('xs', 'ys', 'color', 'size')
+
+    def __init__(self, xs, ys, color, size):
+        """Store the particles' pixel positions, colour and size."""
+        self.xs = xs
+        self.ys = ys
+        self.color = color
+        self.size = size
+
+    def draw(self, surface):
+        """Write every particle into surface's pixels at once."""
+        color = surface.map_rgb(self.color)
+        pixels = pygame.surfarray.pixels2d(surface) # A view of the pixels; locks the surface until deleted.
+        for dx in range(self.size):
+            for dy in range(self.size):
+                pixels[self.xs + dx, self.ys + dy] = color
+        del pixels # Unlock, so the surface can be blitted and shown again.
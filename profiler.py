@@ -0,0 +1,138 @@
+import json
+import os
+from collections import deque
+from time import perf_counter_ns
+
+from assets import fonts
+from text_cache import TextCache
+
+class _Section:
+    """A context manager that times one run of a named section."""
+
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.record(self.name, self.start, perf_counter_ns())
+        return False
+
+
+class FrameProfiler:
+    """A class to time each phase of a frame and keep rolling percentiles.
+
+    Wrap a phase in `with profiler.section('name'):`. The last `window`
+    timings of each section are kept for p50/p95/p99. If trace_path is
+    given, every timing is also kept so it can be written out as a Chrome
+    trace (open it at chrome://tracing or ui.perfetto.dev).
+    """
+
+    enabled = True
+
+    def __init__(self, window=600, trace_path=None, max_trace_events=500_000):
+        """Initialize empty timings."""
+        self.window = window
+        self.timings = {} # Section name -> deque of recent durations in nanoseconds.
+        self.trace_path = trace_path
+        self.max_trace_events = max_trace_events
+        self.trace = [] # (name, start, end) for every timing, when tracing.
+        self.origin = perf_counter_ns() # Trace timestamps are relative to this.
+
+    def section(self, name):
+        """Return a context manager that times the code inside it as name."""
+        return _Section(self, name)
+
+    def record(self, name, start, end):
+        """Store one timing of name, from start to end in nanoseconds."""
+        durations = self.timings.get(name)
+        if durations is None:
+            durations = self.timings[name] = deque(maxlen=self.window)
+        durations.append(end - start)
+        if self.trace_path and len(self.trace) < self.max_trace_events:
+            self.trace.append((name, start, end))
+
+    def percentiles(self, name):
+        """Return the (p50, p95, p99) of name's recent timings, in milliseconds."""
+        durations = sorted(self.timings.get(name, ()))
+        if not durations:
+            return (0.0, 0.0, 0.0)
+        last = len(durations) - 1
+        return tuple(durations[round(last * p)] / 1e6 for p in (0.5, 0.95, 0.99))
+
+    def summary(self):
+        """Return {section: (p50, p95, p99)} for every section, in milliseconds."""
+        return {name: self.percentiles(name) for name in self.timings}
+
+    def report(self):
+        """Return the summary as a table, slowest p95 first."""
+        lines = [f"{'section':<14}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"]
+        for name, (p50, p95, p99) in sorted(self.summary().items(),
+                key=lambda item: -item[1][1]):
+            lines.append(f"{name:<14}{p50:>9.3f}{p95:>9.3f}{p99:>9.3f}")
+        return '\n'.join(lines)
+
+    def write_trace(self, path=None):
+        """Write the recorded timings as Chrome trace JSON to path (default: trace_path)."""
+        path = path or self.trace_path
+        events = [{'name': name, 'ph': 'X', 'pid': os.getpid(), 'tid': 0,
+                   'ts': (start - self.origin) / 1000, 'dur': (end - start) / 1000}
+                  for name, start, end in self.trace] # Chrome wants microseconds.
+        with open(path, 'w') as trace_file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, trace_file)
+
+
+class _NullSection:
+    """A context manager that does nothing, shared by every untimed section."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class NullProfiler:
+    """A profiler that records nothing, used when profiling is off."""
+
+    enabled = False
+    _section = _NullSection()
+
+    def section(self, name):
+        return self._section
+
+
+class ProfilerOverlay:
+    """A class to show the profiler's percentiles on screen, next to the scoreboard."""
+
+    def __init__(self, ai_game, refresh_frames=30):
+        """Initialize the overlay below the ships-left display."""
+        self.profiler = ai_game.profiler
+        self.settings = ai_game.settings
+        self.view = ai_game.view # Scaled and placed like the scoreboard.
+        self.text = TextCache(fonts.load(self.view.length(22)), max_size=256)
+        self.text_color = (30, 30, 30)
+        self.left, self.top = self.view.point(10, 80) # Just under the row of ship icons.
+        self.refresh_frames = refresh_frames # Re-render the figures only this often, so they stay readable.
+        self.frames = 0
+        self.items = []
+
+    def drawables(self):
+        """Return (image, rect) pairs for one line per section, for a renderer."""
+        if self.frames % self.refresh_frames == 0:
+            self.items = []
+            top = self.top
+            for name, (p50, p95, p99) in sorted(self.profiler.summary().items()):
+                line = f"{name}: {p50:.2f} / {p95:.2f} / {p99:.2f} ms"
+                image = self.text.render(line, self.text_color, self.settings.bg_color)
+                self.items.append((image, image.get_rect(left=self.left, top=top)))
+                top += image.get_height() + self.view.length(2)
+        self.frames += 1
+        return self.items
@@ -0,0 +1,112 @@
+import pygame
+
+class FullRenderer:
+    """A class to redraw the whole screen and flip it every frame.
+
+    Renderers take a frame as a list of (source, rect) pairs in drawing
+    order. A source is an image to blit, a colour to fill rect with, or an
+    object with a draw(surface) method that paints only inside rect.
+    """
+
+    def __init__(self, ai_game):
+        """Initialize the renderer for the game's screen."""
+        self.screen = ai_game.screen
+        self.bg_color = ai_game.settings.bg_color
+        self.profiler = ai_game.profiler
+        self.pixels_updated = 0 # Pixels pushed to the display by the last frame.
+
+    def render(self, items):
+        """Draw every item on a fresh background and show the whole screen."""
+        self.screen.fill(self.bg_color)
+        _draw(self.screen, items)
+        with self.profiler.section('flip'):
+            pygame.display.flip()
+        self.pixels_updated = self.screen.get_width() * self.screen.get_height()
+
+    def invalidate(self):
+        """Nothing to do: every frame is drawn in full anyway."""
+
+
+class DirtyRenderer:
+    """A class to redraw and push only the parts of the screen that changed.
+
+    An item counts as unchanged if the same source was drawn at the same rect
+    last frame. Old rects that are gone get painted over with the background,
+    new ones get drawn, and only those regions go to display.update(). If
+    nothing changed at all, the frame isn't presented. If so much changed
+    that patching would cost more than starting over, the whole screen is
+    redrawn instead.
+    """
+
+    max_dirty_rects = 200 # Past this many changed regions, a full redraw is cheaper.
+    max_dirty_share = 0.5 # Likewise past this share of the screen's area.
+
+    def __init__(self, ai_game):
+        """Initialize the renderer for the game's screen."""
+        self.screen = ai_game.screen
+        self.bg_color = ai_game.settings.bg_color
+        self.profiler = ai_game.profiler
+        self.previous = None # Last frame's items, keyed on (source, rect).
+        self.pixels_updated = 0
+
+    def render(self, items):
+        """Draw the frame, touching only the regions that changed since the last one."""
+        current = {(source, tuple(rect)): rect for source, rect in items}
+        previous = self.previous
+        self.previous = current
+        screen_area = self.screen.get_width() * self.screen.get_height()
+
+        if previous is None:
+            self._redraw_all(items) # Nothing on screen yet, so paint it all once.
+            return
+
+        stale = [rect for key, rect in previous.items() if key not in current]
+        fresh = [rect for key, rect in current.items() if key not in previous]
+        dirty = stale + fresh
+        if not dirty:
+            self.pixels_updated = 0 # Identical frame: skip presenting it.
+            return
+        dirty_area = sum(rect[2] * rect[3] for rect in dirty)
+        if (len(dirty) > self.max_dirty_rects
+                or dirty_area > self.max_dirty_share * screen_area):
+            self._redraw_all(items)
+            return
+
+        for rect in stale:
+            self.screen.fill(self.bg_color, rect)
+
+        # Redraw every new item, plus any unchanged item that touches a changed
+        #   region, in the original order so overlapping items still stack correctly.
+        _draw(self.screen, [(source, rect) for source, rect in items
+                if (source, tuple(rect)) not in previous
+                or pygame.Rect(rect).collidelist(dirty) != -1])
+
+        with self.profiler.section('flip'):
+            pygame.display.update(dirty)
+        self.pixels_updated = dirty_area
+
+    def invalidate(self):
+        """Redraw and show the whole screen next frame, e.g. after the window was uncovered."""
+        self.previous = None
+
+    def _redraw_all(self, items):
+        """Paint the background and every item, and show the whole screen."""
+        self.screen.fill(self.bg_color)
+        _draw(self.screen, items)
+        with self.profiler.section('flip'):
+            pygame.display.flip()
+        self.pixels_updated = self.screen.get_width() * self.screen.get_height()
+
+
+def _draw(screen, items):
+    """Fill the colour items, blit the image items and draw the rest onto screen, in order."""
+    for source, rect in items:
+        if isinstance(source, tuple):
+            screen.fill(source, rect)
+        elif isinstance(source, pygame.Surface):
+            screen.blit(source, rect)
+        else:
+            source.draw(screen)
+
+
+RENDERERS = {'full': FullRenderer, 'dirty': DirtyRenderer}
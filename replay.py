@@ -0,0 +1,140 @@
+import json
+import struct
+
+import pygame
+
+from alien_invasion import AlienInvasion
+from settings import Settings
+from viewport import Viewport
+
+MAGIC = b'AIREPLAY'
+VERSION = 1
+
+# Every record starts with the tick it happened on and its kind. Input records
+#   then hold three integers (key, or button and x, y); the end record holds
+#   the final score and level.
+HEAD = struct.Struct('<IB')
+INPUT = struct.Struct('<IBiii')
+END_RECORD = struct.Struct('<IBqi')
+KEYDOWN, KEYUP, CLICK, END = 1, 2, 3, 255
+
+
+class InputRecorder:
+    """A class to pass input through to the game while saving it to a file.
+
+    The file holds the settings the game started with, then one small record
+    per key press, key release and mouse click, stamped with the tick it
+    arrived on. close() adds the final tick, score and level, so a replay
+    can check it ends up in the same place.
+    """
+
+    def __init__(self, source, path, settings):
+        """Start recording source's events to path."""
+        self.source = source
+        self.settings = settings
+        self.view = None # Made on the first click, once the window is open.
+        self.file = open(path, 'wb')
+        header = json.dumps(vars(settings)).encode()
+        self.file.write(MAGIC + struct.pack('<HI', VERSION, len(header)) + header)
+
+    def poll(self, tick):
+        """Return the source's events for this tick, recording the ones that matter."""
+        events = self.source.poll(tick)
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                self.file.write(INPUT.pack(tick, KEYDOWN, event.key, 0, 0))
+            elif event.type == pygame.KEYUP:
+                self.file.write(INPUT.pack(tick, KEYUP, event.key, 0, 0))
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                # Clicks are saved in logical units, so they land on the same button in a headless replay.
+                if self.view is None:
+                    self.view = Viewport((self.settings.screen_width, self.settings.screen_height),
+                            pygame.display.get_surface().get_size())
+                self.file.write(INPUT.pack(tick, CLICK, event.button, *self.view.to_logical(event.pos)))
+        return events
+
+    def close(self, ai_game):
+        """Write where the game ended up and close the file."""
+        if self.file.closed:
+            return
+        self.file.write(END_RECORD.pack(ai_game.ticks, END, ai_game.stats.score,
+                ai_game.stats.level))
+        self.file.close()
+        self.source.close(ai_game)
+
+
+class ReplayInput:
+    """A class to feed a recorded session back to the game, tick by tick."""
+
+    def __init__(self, path):
+        """Load the recording at path."""
+        with open(path, 'rb') as replay_file:
+            data = replay_file.read()
+        if not data.startswith(MAGIC):
+            raise ValueError(f"{path} is not an Alien Invasion recording")
+        offset = len(MAGIC)
+        version, header_size = struct.unpack_from('<HI', data, offset)
+        if version != VERSION:
+            raise ValueError(f"{path} is version {version}, expected {VERSION}")
+        offset += struct.calcsize('<HI')
+        self.settings_values = json.loads(data[offset:offset + header_size])
+        offset += header_size
+
+        self.events_by_tick = {}
+        self.end = None # (tick, score, level) when the recording was closed.
+        while offset < len(data):
+            tick, kind = HEAD.unpack_from(data, offset)
+            if kind == END:
+                tick, kind, score, level = END_RECORD.unpack_from(data, offset)
+                self.end = (tick, score, level)
+                offset += END_RECORD.size
+                continue
+            a, b, c = INPUT.unpack_from(data, offset)[2:]
+            offset += INPUT.size
+            if kind == KEYDOWN:
+                event = pygame.event.Event(pygame.KEYDOWN, key=a)
+            elif kind == KEYUP:
+                event = pygame.event.Event(pygame.KEYUP, key=a)
+            else:
+                event = pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=a, pos=(b, c))
+            self.events_by_tick.setdefault(tick, []).append(event)
+
+        # Without an end record, play until just after the last input.
+        self.last_tick = self.end[0] if self.end else max(self.events_by_tick, default=0) + 1
+
+    def make_settings(self):
+        """Return Settings matching the ones the recorded game started with."""
+        settings = Settings()
+        for name, value in self.settings_values.items():
+            setattr(settings, name, tuple(value) if isinstance(value, list) else value) # JSON turned the colour tuples into lists.
+        return settings
+
+    def poll(self, tick):
+        """Return the events recorded for this tick."""
+        return self.events_by_tick.get(tick, ())
+
+    def close(self, ai_game):
+        """Nothing to clean up."""
+
+
+def replay(path):
+    """Play a recording headless at full speed and report where it ended up.
+
+    Returns a dict of the final tick, score and level, the values the
+    recording expected (if it has an end record) and whether they match.
+    """
+    source = ReplayInput(path)
+    ai_game = AlienInvasion(headless=True, input_source=source,
+            settings=source.make_settings())
+    try:
+        ai_game.step(source.last_tick)
+    except SystemExit:
+        pass # The player quit; the game stops where they did.
+
+    result = {'ticks': ai_game.ticks, 'score': ai_game.stats.score,
+              'level': ai_game.stats.level}
+    if source.end:
+        tick, score, level = source.end
+        result['expected'] = {'ticks': tick, 'score': score, 'level': level}
+        result['matches'] = (score, level) == (result['score'], result['level'])
+    return result
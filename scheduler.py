@@ -0,0 +1,25 @@
+import pygame
+
+class FixedStepScheduler:
+    """A class to run the simulation at a fixed tick rate, apart from rendering."""
+
+    def __init__(self, tick_rate, max_frame_time=0.25):
+        """Initialize the clock and the time carried between frames."""
+        self.tick_time = 1.0 / tick_rate # Seconds of game time simulated by one tick.
+        self.max_frame_time = max_frame_time # Longest frame we'll catch up on, so a stall can't snowball.
+        self.clock = pygame.time.Clock()
+        self.accumulator = 0.0 # Real time that hasn't been simulated yet.
+
+    def advance(self, max_fps=0):
+        """Wait for the next frame and return how many ticks to simulate."""
+        elapsed = self.clock.tick(max_fps) / 1000 # tick() sleeps to hold the frame cap, then returns milliseconds since last call.
+        self.accumulator += min(elapsed, self.max_frame_time)
+
+        ticks = int(self.accumulator // self.tick_time)
+        self.accumulator -= ticks * self.tick_time
+        return ticks
+
+    @property
+    def alpha(self):
+        """How far between the last tick and the next one this frame falls (0-1)."""
+        return self.accumulator / self.tick_time
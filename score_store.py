@@ -0,0 +1,149 @@
+import atexit
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+_STOP = object() # Tells the writer thread to finish up.
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS scores (
+    difficulty TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    ticks INTEGER NOT NULL,
+    played_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_by_difficulty ON scores (difficulty, score DESC);
+CREATE TABLE IF NOT EXISTS sessions (
+    started_at REAL NOT NULL,
+    ended_at REAL NOT NULL,
+    games INTEGER NOT NULL,
+    best_score INTEGER NOT NULL,
+    ticks INTEGER NOT NULL
+);
+'''
+
+
+class ScoreStore:
+    """A class to keep the top scores for each difficulty in an SQLite file.
+
+    The scores are read once when the store opens and kept in memory, so
+    looking them up never touches the disk. New results are handed to a
+    background thread, which writes everything that has queued up in one
+    transaction. SQLite commits are atomic, so quitting or crashing
+    mid-write leaves the file as it was before that batch.
+    """
+
+    def __init__(self, path, top_n=10):
+        """Open (or create) the score file at path and load its top scores."""
+        self.path = path
+        self.top_n = top_n
+
+        connection = self._connect()
+        self.top_scores = {} # Difficulty -> list of scores, highest first.
+        for difficulty, score in connection.execute(
+                'SELECT difficulty, score FROM scores ORDER BY score DESC'):
+            scores = self.top_scores.setdefault(difficulty, [])
+            if len(scores) < top_n:
+                scores.append(score)
+        connection.close()
+
+        # This session's totals, written when the store closes.
+        self.started_at = time.time()
+        self.games = 0
+        self.best_score = 0
+        self.ticks = 0
+
+        self.queue = queue.Queue()
+        self.writer = threading.Thread(target=self._write_loop, name='score-writer',
+                daemon=True)
+        self.writer.start()
+        atexit.register(self.close) # Flush whatever is queued, even if close() is never called.
+
+    def _connect(self):
+        """Open a connection to the file, creating the tables if needed."""
+        connection = sqlite3.connect(self.path)
+        connection.execute('PRAGMA journal_mode=WAL') # Readers never wait on the writer, and commits survive a crash.
+        connection.executescript(SCHEMA)
+        return connection
+
+    def best(self, difficulty):
+        """Return the highest score saved for difficulty, or 0."""
+        scores = self.top_scores.get(difficulty)
+        return scores[0] if scores else 0
+
+    def top(self, difficulty):
+        """Return the saved top scores for difficulty, highest first."""
+        return list(self.top_scores.get(difficulty, ()))
+
+    def record_game(self, difficulty, score, level, ticks):
+        """Add a finished game's result; it's written to disk in the background."""
+        scores = self.top_scores.setdefault(difficulty, [])
+        scores.append(score)
+        scores.sort(reverse=True)
+        del scores[self.top_n:]
+
+        self.games += 1
+        self.best_score = max(self.best_score, score)
+        self.ticks += ticks
+        self.queue.put(('game', (difficulty, score, level, ticks, time.time())))
+
+    def close(self):
+        """Write this session's totals, wait for every queued write and stop the writer."""
+        if not self.writer.is_alive():
+            return
+        self.queue.put(('session', (self.started_at, time.time(), self.games,
+                self.best_score, self.ticks)))
+        self.queue.put(_STOP)
+        self.writer.join()
+
+    def _write_loop(self):
+        """Wait for writes and commit each batch of them in one transaction.
+
+        A batch that fails to write, e.g. because the file is locked or
+        read-only, is reported and dropped; the loop keeps going, so later
+        scores still get their chance.
+        """
+        try:
+            connection = self._connect() # SQLite connections belong to the thread that made them.
+        except sqlite3.Error as error:
+            print(f"Can't open score file {self.path}; scores won't be saved: {error}",
+                    file=sys.stderr)
+            connection = None
+        stopping = False
+        while not stopping:
+            batch = [self.queue.get()] # Sleep until there's something to write.
+            while True: # Then take everything else that's already waiting.
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if _STOP in batch:
+                stopping = True
+                batch = [item for item in batch if item is not _STOP]
+
+            if connection is None or not batch:
+                continue # Still drain the queue, so close() doesn't wait forever.
+            try:
+                self._write_batch(connection, batch)
+            except sqlite3.Error as error:
+                print(f"Couldn't save {len(batch)} score(s) to {self.path}: {error}",
+                        file=sys.stderr)
+        if connection is not None:
+            connection.close()
+
+    def _write_batch(self, connection, batch):
+        """Write one batch of queued games and sessions in a single transaction."""
+        games = [values for kind, values in batch if kind == 'game']
+        sessions = [values for kind, values in batch if kind == 'session']
+        with connection: # Commits the whole batch, or none of it.
+            connection.executemany('INSERT INTO scores VALUES (?, ?, ?, ?, ?)', games)
+            connection.executemany('INSERT INTO sessions VALUES (?, ?, ?, ?, ?)', sessions)
+            for difficulty in {values[0] for values in games}:
+                # Keep only the top scores, so the file stays small.
+                connection.execute('''DELETE FROM scores WHERE difficulty = ?
+                        AND rowid NOT IN (SELECT rowid FROM scores WHERE difficulty = ?
+                        ORDER BY score DESC LIMIT ?)''',
+                        (difficulty, difficulty, self.top_n))
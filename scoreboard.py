@@ -1,7 +1,5 @@
-import pygame.font
-from pygame.sprite import Group
-
-from ship import Ship
+from assets import fonts, images
+from text_cache import TextCache
 
 class Scoreboard:
     """A class to report scoring information."""
@@ -10,38 +8,58 @@ class Scoreboard:
         """Initialize scorekeeping attributes."""
         self.ai_game = ai_game
         self.screen = ai_game.screen
-        self.screen_rect = self.screen.get_rect()
+        self.view = ai_game.view
+        self.screen_rect = self.view.rect # The scoreboard is laid out in display pixels, around the play area.
         self.settings = ai_game.settings
         self.stats = ai_game.stats
 
         # Font settings for scoring information.
         self.text_color = (30, 30, 30)
-        self.font = pygame.font.SysFont(None, 48)
-        # Prepare the initial score image.
+        self.font = fonts.load(self.view.length(48)) # The same font object the buttons use, scaled with the display.
+        self.text = TextCache(self.font) # Reuses renders of values we've shown before.
+
+        # The value each image was last rendered for, so unchanged values aren't re-rendered.
+        self.shown = {}
+
+        # One shared ship image serves as every life icon.
+        self.ship_icon = images.scaled(self.settings.ship_image, self.view.scale)
+
+        # Nothing is rendered until the first game starts and calls prep_images().
+        self.ready = False
+
+    def prep_images(self):
+        """Render the score, high score, level and ships left."""
         self.prep_score()
         self.prep_high_score()
         self.prep_level()
         self.prep_ships()
+        self.ready = True
 
 
     def prep_score(self):
         """Turn the score into a rendered image."""
         rounded_score = round(self.stats.score, -1) # round() function normally rounds a decimal number to a set number of decimal places given as the second argument.
                                                     # When passing a neg number as 2nd arg, round() will round value to nearest 10, 100, 1000, and so on.
+        if self.shown.get('score') == rounded_score:
+            return # The displayed score hasn't changed, so neither does the image.
+        self.shown['score'] = rounded_score
         score_str = "{:,}".format(rounded_score) # A string formatting directive tells Python to insert commas into numbers when converting a numerical value to a string.
-        self.score_image = self.font.render(score_str, True, # Then pass this string to render(), which creates the image.
+        self.score_image = self.text.render(score_str, # Then pass this string to render(), which creates the image (or reuses a cached one).
                 self.text_color, self.settings.bg_color) # To display score clearly, we pass screen's background color and text color to render().
 
         # Display the score at the top right of the screen.
         self.score_rect = self.score_image.get_rect()
-        self.score_rect.right = self.screen_rect.right - 20 # Making sure score always lines up with right side of screen and its right edge 20 pixels from right edge of screen.
-        self.score_rect.top = 20    # Place top edge 20 pixels down from top of the screen.
+        self.score_rect.right = self.screen_rect.right - self.view.length(20) # Making sure score always lines up with right side of screen and its right edge 20 pixels from right edge of screen.
+        self.score_rect.top = self.screen_rect.top + self.view.length(20)    # Place top edge 20 pixels down from top of the screen.
 
     def prep_high_score(self):
         """Turn the high score into a rendered image."""
         high_score = round(self.stats.high_score, -1) # Round the high score to nearest 10
+        if self.shown.get('high_score') == high_score:
+            return
+        self.shown['high_score'] = high_score
         high_score_str = "{:,}".format(high_score) # Format it with commas.
-        self.high_score_image = self.font.render(high_score_str, True, # Generate an image from high score
+        self.high_score_image = self.text.render(high_score_str, # Generate an image from high score
                 self.text_color, self.settings.bg_color)
 
         # Center the high score at the top of the screen.
@@ -57,28 +75,68 @@ class Scoreboard:
 
     def show_score(self):
         """Draw scores, level and ships to the screen."""
-        self.screen.blit(self.score_image, self.score_rect)
-        self.screen.blit(self.high_score_image, self.high_score_rect)
-        self.screen.blit(self.level_image, self.level_rect)
-        self.ships.draw(self.screen)
+        self.screen.blits(self.drawables(), False)
+
+    def drawables(self):
+        """Return (image, rect) pairs for the scores, level and ships, for a renderer."""
+        if not self.ready:
+            return [] # No game has started yet.
+        items = [(self.score_image, self.score_rect),
+                (self.high_score_image, self.high_score_rect),
+                (self.level_image, self.level_rect)]
+        items += [(self.ship_icon, rect) for rect in self.ship_rects]
+        return items
 
     def prep_level(self):
         """Turn the level into a rendered image."""
-
+        if self.shown.get('level') == self.stats.level:
+            return
+        self.shown['level'] = self.stats.level
         level_str = str(self.stats.level,)
-        self.level_image = self.font.render(level_str, True,
+        self.level_image = self.text.render(level_str,
                 self.text_color, self.settings.bg_color)
 
         # Position the level below the score.
         self.level_rect = self.level_image.get_rect()
         self.level_rect.right = self.score_rect.right # Sets image right attribute to match score's right attribute
-        self.level_rect.top = self.score_rect.bottom + 10 # Sets top attribute 10 pixels beneath the bottom of score image to leave space between score and level.
+        self.level_rect.top = self.score_rect.bottom + self.view.length(10) # Sets top attribute 10 pixels beneath the bottom of score image to leave space between score and level.
     
     def prep_ships(self):
         """Show how many ships are left."""
-        self.ships = Group() # Creates an empty group to hold the ship instances
-        for ship_number in range(self.stats.ships_left): # Group is filled when loop is run once for every ship the player has left
-            ship = Ship(self.ai_game)
-            ship.rect.x = 10 + ship_number * ship.rect.width # Ships appear next to each other with a 10-pixel margin on left side of the group of ships
-            ship.rect.y = 10 # Set y-coord value 10 pixels down from top of screen os ships appear in upper-left corner of screen
-            self.ships.add(ship) # Add each new ship to the group ships.
\ No newline at end of file
+        # Every icon is the same cached ship image; we only work out where each one goes.
+        width = self.ship_icon.get_width()
+        left, top = self.view.point(10, 10)
+        self.ship_rects = [self.ship_icon.get_rect(x=left + ship_number * width, y=top) # Ships appear next to each other with a 10-pixel margin,
+                for ship_number in range(self.stats.ships_left)]                      #   10 pixels down from the top of the screen.
+
+
+class HeadlessScoreboard(Scoreboard):
+    """A scoreboard for headless games: it tracks the high score but renders nothing."""
+
+    def __init__(self, ai_game):
+        """Keep references to the stats, without loading a font."""
+        self.ai_game = ai_game
+        self.settings = ai_game.settings
+        self.stats = ai_game.stats
+        self.ready = True # Nothing to render, so it's always up to date.
+
+    def prep_score(self):
+        pass
+
+    def prep_high_score(self):
+        pass
+
+    def prep_level(self):
+        pass
+
+    def prep_ships(self):
+        pass
+
+    def prep_images(self):
+        pass
+
+    def show_score(self):
+        pass
+
+    def drawables(self):
+        return []
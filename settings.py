@@ -1,61 +1,82 @@
+import waves
+
 class Settings:
     """A class to store all settings for Alien Invasion."""
 
     def __init__(self):
         """Initialize the game's settings."""
 
-        # Screen settings
+        # Screen settings. The game is laid out and runs in this logical resolution
+        #   on any display; drawing is scaled to fit the window (see viewport.py).
         self.screen_width = 1200
         self.screen_height = 800
+        self.display_size = None # Window size in pixels; None makes it the logical size.
+        self.fullscreen = False # Fill the whole display at its own resolution instead.
         self.bg_color = (230, 230, 230)
+        self.render_mode = 'dirty' # 'dirty' redraws only what changed; 'full' redraws and flips the whole screen.
+
+        # Timing settings
+        self.tick_rate = 120 # Simulation ticks per second, the same on every machine.
+        self.reference_fps = 120 # Speeds below are in pixels per frame at this frame rate.
+        self.max_fps = 60 # Frame cap while playing; 0 means uncapped.
+        self.menu_fps = 30 # Lower frame cap for the menu, where nothing moves.
+        self.respawn_pause = 0.5 # Seconds the game holds still after the ship is hit.
+        self.level_pause = 0.0 # Seconds between clearing a fleet and the next one arriving.
+        self.skip_pauses = False # Skip both pauses, e.g. for headless batch runs.
+        self.rewind_ticks = 0 # Ticks of history kept for AlienInvasion.rewind(); 0 keeps none.
+
+        # High scores, kept per difficulty. None keeps them in memory only.
+        self.score_file = 'scores.db'
+        self.top_scores_kept = 10
+
+        # Image files, loaded once through the shared image cache.
+        self.ship_image = 'images/ship.bmp'
+        self.alien_image = 'images/alien.bmp'
+        self.image_colorkey = (230, 230, 230) # Background colour of the images; not part of the sprite.
+        self.pixel_collisions = True # Hits need the sprites' pixels to touch, not just their rects.
+
+        # Control settings: action -> pygame key name. Remap with Controls.bind().
+        self.key_bindings = {'move_left': 'left', 'move_right': 'right',
+                'fire': 'space', 'play': 'p', 'quit': 'q'}
+        self.autofire_rate = 0 # Shots per second while fire is held down; 0 fires once per press.
 
-        # Ship settings
-        self.ship_limit = 3
+        # Explosion particles
+        self.max_particles = 2000 # Budget; bursts shrink as it fills up.
+        self.particles_per_kill = 24
+        self.particle_speed = 3.0 # Top speed, in pixels per frame.
+        self.particle_gravity = 0.05
+        self.particle_life = 0.6 # Seconds.
+        self.particle_size = 2
+        self.particle_color = (250, 150, 30)
 
         # Bullet settings
         self.bullet_width = 3
         self.bullet_height = 15
         self.bullet_color = (60, 60, 60)
-        self.bullets_allowed = 3
 
         # Alien settings
         self.fleet_drop_speed = 10 # Controls how quickly the fleet drops down the screen each time an alien reaches either edge.
         # fleet_direction of 1 represents right; -1 represents left.
 
-        # How quickly the game speeds up
-        self.speedup_scale = 1.1
-
-        # How quickly the alien point values increase
-        self.score_scale = 1.5
-
+        # Lives (ship_limit), bullets_allowed, the speeds, alien_points and how
+        #   quickly speeds and points grow (speedup_scale, score_scale) are set
+        #   per difficulty in the waves file, not here.
         self.difficulty_level = 'medium'
 
+        # Difficulties, fleet formations and the order of waves; see waves.py.
+        self.waves_file = 'waves.json'
+
         self.initialize_dynamic_settings() # Initializes values for attributes that need to change throughout the game.
 
     def initialize_dynamic_settings(self):
         """Initialize settings that change throughout the game."""
-        if self.difficulty_level == 'easy':
-            self.ship_limit = 5
-            self.bullets_allowed = 10  
-            self.ship_speed = 0.75
-            self.bullet_speed = 1.5
-            self.alien_speed = 0.5
-        elif self.difficulty_level == 'medium':
-            self.ship_limit = 3
-            self.bullets_allowed = 3 
-            self.ship_speed = 1.5
-            self.bullet_speed = 3.0
-            self.alien_speed = 1
-        elif self.difficulty_level == 'difficult':
-            self.ship_limit = 2
-            self.bullets_allowed = 3 
-            self.ship_speed = 3.0
-            self.bullet_speed = 6.0
-            self.alien_speed = 2.0
-
+        # Lives, bullets, speeds, points and how fast they grow all come from
+        #   the difficulty's entry in the waves file.
+        book = waves.load(self.waves_file)
+        for name, value in book.difficulty(self.difficulty_level).items():
+            setattr(self, name, value)
 
         self.fleet_direction = 1
-        self.alien_points = 50
 
     def increase_speed(self):
         """Increase speed settings and alien point values."""
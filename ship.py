@@ -1,48 +1,64 @@
 import pygame
-from pygame.sprite import Sprite
 
-class Ship(Sprite): # Import Sprite
+from assets import images
+
+class Ship:
     """A class to manage the ship."""
 
+    __slots__ = ('screen', 'settings', 'screen_rect', 'view', 'image', 'display_image', 'mask',
+            'rect', 'x', 'prev_x', 'moving_right', 'moving_left') # No per-instance __dict__.
+
     def __init__(self, ai_game): # Paremeters: self reference and self reference to current instance of AlienInvasion class.
         """Initialize the ship and set its starting position."""
-        super().__init__()
         self.screen = ai_game.screen # Assign screen to attribute of ship, so we can access it easily in all methods in this class.
         self.settings = ai_game.settings
-        self.screen_rect = ai_game.screen.get_rect() # Access screen's rect attribute using get_rect() and allows us to place ship in correct location on the screen.
+        self.screen_rect = ai_game.screen_rect # Access screen's rect attribute using get_rect() and allows us to place ship in correct location on the screen.
+        self.view = ai_game.view # Maps the ship's logical position onto the display.
 
-        # Load the ship image and get its rect.
-        self.image = pygame.image.load('images/ship.bmp')
+        # Get the shared ship image and its rect.
+        self.image = images.load(self.settings.ship_image)
+        self.mask = images.mask(self.settings.ship_image, self.settings.image_colorkey) # Shared, for pixel-accurate hits.
         self.rect = self.image.get_rect() # When image is loaded, we call get_rect() to access the ship's surface rect attribute so we can later use it to place the ship.
+        self.display_image = images.scaled(self.settings.ship_image, self.view.scale) # Sized for the display, once.
 
         # Start each new ship at the bottom center of the screen.
         self.rect.midbottom = self.screen_rect.midbottom
 
         # Store a decimal value for the ship's horizontal position.
         self.x = float(self.rect.x)
+        self.prev_x = self.x
 
         # Movement flag
         self.moving_right = False
         self.moving_left = False
 
-    def update(self):
+    def update(self, dt=1.0):
         """Update the ship's position based on the movement flag."""
-        # Update the ship's x value, not the rect.
+        self.prev_x = self.x # Remember where the last tick left the ship, for interpolated drawing.
+
+        # Update the ship's x value, not the rect. dt scales the per-frame speed to the tick length.
         if self.moving_right and self.rect.right < self.screen_rect.right: # self.rect.right returns x-coordinate of right edge of ship's rect.
-            self.x += self.settings.ship_speed                             # If this value is < value returned by self.screen_rect.right, ship hasn't reached right edge of screen.
+            self.x += self.settings.ship_speed * dt                        # If this value is < value returned by self.screen_rect.right, ship hasn't reached right edge of screen.
         if self.moving_left and self.rect.left > 0: # If value of left side of rect is > 0 the ship hasn't reached left edge of screen. # Ensures ship is within these bounds before adjusting value of x.
-            self.x -= self.settings.ship_speed
+            self.x -= self.settings.ship_speed * dt
 
         # Update rect object from self.x.
         self.rect.x = self.x # controls position of ship
 
 
-    def blitme(self):
-        """Draw the ship at its current location."""
-        self.screen.blit(self.image, self.rect)
+    def blitme(self, alpha=1.0):
+        """Draw the ship, alpha of the way from its last position to its current one."""
+        self.screen.blit(*self.drawable(alpha))
+
+    def drawable(self, alpha=1.0):
+        """Return the (image, rect) to draw the ship with on the display, for a renderer."""
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        return self.display_image, pygame.Rect(self.view.point(x, self.rect.y),
+                self.display_image.get_size())
 
 
     def center_ship(self):
         """Center the ship on the screen."""
         self.rect.midbottom = self.screen_rect.midbottom
-        self.x = float(self.rect.x)
\ No newline at end of file
+        self.x = float(self.rect.x)
+        self.prev_x = self.x # Don't draw the ship sliding back to the centre.
@@ -0,0 +1,195 @@
+import struct
+
+import numpy as np
+
+import waves
+
+# Everything about a running game that isn't an array, in one fixed-size block:
+#   game:     ticks
+#   stats:    game_active, state, ships_left, score, level, high_score, start_tick
+#   settings: difficulty_level, fleet_direction, ship_speed, bullet_speed, alien_speed,
+#             alien_points, bullets_allowed, speedup_scale, score_scale, ship_limit
+#   ship:     x, prev_x, rect.x, moving_left, moving_right
+#   controls: fire_held, fire_countdown
+#   timers:   ticks left on each of TIMERS, 0 if it isn't running
+#   fleet:    number of slots, offset_x, offset_y, last_move (dx, dy), drop so far this tick
+#   bullets:  number in flight
+HEADER = struct.Struct('<q ?Biqiqq Bbdddqiddi ddi?? ?i ii iddddd i')
+
+# The fleet's x, y, prev_x and prev_y columns (float64) follow the header,
+#   then its alive column (one byte per alien), then rect.x, rect.y, y and
+#   prev_y (float64) for each bullet in flight.
+FLEET_COLUMNS = ('x', 'y', 'prev_x', 'prev_y')
+BULLET_FIELDS = 4
+
+STATES = ('playing', 'respawning', 'level_transition') # Stored as an index.
+TIMERS = (('respawn', '_respawn'), ('next_level', '_start_next_level')) # Timer name and the game method it calls.
+
+
+def _difficulties(settings):
+    """Return the names of the difficulties in the game's waves file, in file order."""
+    return list(waves.load(settings.waves_file).difficulties)
+
+
+def save(ai_game):
+    """Return the state of ai_game as one flat bytes buffer."""
+    stats, settings, ship = ai_game.stats, ai_game.settings, ai_game.ship
+    controls, timers = ai_game.controls, ai_game.timers.timers
+    fleet, pool = ai_game.aliens, ai_game.bullets
+
+    bullets = np.empty((pool.active, BULLET_FIELDS))
+    for slot, bullet in enumerate(pool.bullets[:pool.active]):
+        bullets[slot] = (bullet.rect.x, bullet.rect.y, bullet.y, bullet.prev_y)
+
+    header = HEADER.pack(
+        ai_game.ticks,
+        stats.game_active, STATES.index(stats.state), stats.ships_left, stats.score,
+        stats.level, stats.high_score, stats.start_tick,
+        _difficulties(settings).index(settings.difficulty_level),
+        settings.fleet_direction, settings.ship_speed, settings.bullet_speed,
+        settings.alien_speed, settings.alien_points, settings.bullets_allowed,
+        settings.speedup_scale, settings.score_scale, settings.ship_limit,
+        ship.x, ship.prev_x, ship.rect.x, ship.moving_left, ship.moving_right,
+        controls.fire_held, controls.fire_countdown,
+        *[timers[name][0] if name in timers else 0 for name, _ in TIMERS],
+        len(fleet.x), fleet.offset_x, fleet.offset_y, *fleet.last_move, fleet._dropped,
+        pool.active)
+    return b''.join([header] + [getattr(fleet, name).tobytes() for name in FLEET_COLUMNS]
+            + [fleet.alive.tobytes(), bullets.tobytes()])
+
+
+def restore(ai_game, buffer):
+    """Put ai_game back into the state saved in buffer by save().
+
+    The game must have been made with the same settings, screen size and
+    waves file as the one that was saved. Nothing is loaded or rebuilt: the
+    fleet's spawn arrays, alien views and row images are reused, and only
+    rows whose aliens came back or died are redrawn.
+    """
+    (ticks,
+     game_active, state, ships_left, score, level, high_score, start_tick,
+     difficulty, fleet_direction, ship_speed, bullet_speed, alien_speed, alien_points,
+     bullets_allowed, speedup_scale, score_scale, ship_limit,
+     ship_x, ship_prev_x, ship_left, moving_left, moving_right,
+     fire_held, fire_countdown,
+     *timer_ticks,
+     slots, offset_x, offset_y, move_x, move_y, dropped,
+     active) = HEADER.unpack_from(buffer)
+
+    offset = HEADER.size
+    columns = []
+    for _ in FLEET_COLUMNS:
+        columns.append(np.frombuffer(buffer, float, slots, offset))
+        offset += 8 * slots
+    alive = np.frombuffer(buffer, bool, slots, offset)
+    offset += slots
+    bullets = np.frombuffer(buffer, float, active * BULLET_FIELDS, offset).reshape(
+            active, BULLET_FIELDS).tolist()
+
+    ai_game.ticks = ticks
+
+    stats, sb = ai_game.stats, ai_game.sb
+    score_changed = (stats.score, stats.high_score) != (score, high_score)
+    level_changed = stats.level != level
+    ships_changed = stats.ships_left != ships_left
+    stats.game_active = game_active
+    stats.state = STATES[state]
+    stats.ships_left, stats.score, stats.level = ships_left, score, level
+    stats.high_score, stats.start_tick = high_score, start_tick
+
+    settings = ai_game.settings
+    settings.difficulty_level = _difficulties(settings)[difficulty]
+    settings.fleet_direction = fleet_direction
+    settings.ship_speed, settings.bullet_speed = ship_speed, bullet_speed
+    settings.alien_speed, settings.alien_points = alien_speed, alien_points
+    settings.bullets_allowed = bullets_allowed
+    settings.speedup_scale, settings.score_scale = speedup_scale, score_scale
+    settings.ship_limit = ship_limit
+
+    ship = ai_game.ship
+    ship.x, ship.prev_x, ship.rect.x = ship_x, ship_prev_x, ship_left
+    ship.moving_left, ship.moving_right = moving_left, moving_right
+
+    ai_game.controls.fire_held = fire_held
+    ai_game.controls.fire_countdown = fire_countdown
+
+    timers = ai_game.timers.timers
+    timers.clear()
+    for (name, method), left in zip(TIMERS, timer_ticks):
+        if left:
+            timers[name] = [left, getattr(ai_game, method)]
+
+    fleet = ai_game.aliens
+    if slots:
+        xs, ys = ai_game._fleet_layout()
+        if len(xs) != slots:
+            raise ValueError("snapshot's fleet doesn't match this game's formation")
+    else:
+        xs = ys = ()
+    fleet.restore(xs, ys, *columns, alive, offset_x, offset_y, (move_x, move_y), dropped)
+
+    pool = ai_game.bullets
+    if len(pool.bullets) != bullets_allowed:
+        pool.resize(bullets_allowed)
+    pool.active = active
+    for bullet, (left, top, y, prev_y) in zip(pool.bullets, bullets):
+        bullet.rect.x, bullet.rect.y = left, top
+        bullet.y, bullet.prev_y = y, prev_y
+
+    ai_game.particles.clear() # Explosions are only for show, so they aren't saved.
+
+    # Re-render only the scoreboard images whose numbers changed, or all of
+    #   them if this game hasn't drawn its scoreboard yet.
+    if not sb.ready:
+        sb.prep_images()
+        return
+    if score_changed:
+        sb.prep_score()
+        sb.prep_high_score()
+    if level_changed:
+        sb.prep_level()
+    if ships_changed:
+        sb.prep_ships()
+
+
+class SnapshotRing:
+    """A class to keep a game's most recent snapshots, for rewinding.
+
+    It holds up to capacity buffers from save(), oldest first, in a fixed
+    list of slots; once full, each new snapshot replaces the oldest one.
+    """
+
+    def __init__(self, capacity):
+        """Make an empty ring with room for capacity snapshots."""
+        self.slots = [None] * capacity
+        self.next = 0 # Slot the next snapshot goes in.
+        self.size = 0 # Snapshots held.
+
+    def push(self, buffer):
+        """Add a snapshot, dropping the oldest if the ring is full."""
+        self.slots[self.next] = buffer
+        self.next = (self.next + 1) % len(self.slots)
+        self.size = min(self.size + 1, len(self.slots))
+
+    def latest(self, back=0):
+        """Return the snapshot from back pushes before the newest one."""
+        if not 0 <= back < self.size:
+            raise IndexError("not that many snapshots kept")
+        return self.slots[(self.next - 1 - back) % len(self.slots)]
+
+    def rewind(self, back=0):
+        """Return the snapshot from back pushes ago and forget every newer one."""
+        buffer = self.latest(back)
+        for _ in range(back):
+            self.next = (self.next - 1) % len(self.slots)
+            self.slots[self.next] = None
+        self.size -= back
+        return buffer
+
+    def clear(self):
+        """Forget every snapshot."""
+        self.slots = [None] * len(self.slots)
+        self.next = self.size = 0
+
+    def __len__(self):
+        return self.size
@@ -0,0 +1,199 @@
+"""Play many headless games across a process pool and tabulate the results.
+
+For difficulty tuning: every combination of the given settings is played
+by a bot for a number of games, and score, level reached and ticks
+survived are averaged per combination. Run from the project folder:
+
+    python sweep.py --difficulty easy medium --alien-speed 0.5 1 2 --games 200
+
+Each game is an independent AlienInvasion in headless mode, so nothing
+touches the display and one game runs per worker process at a time.
+"""
+import argparse
+import csv
+import itertools
+import multiprocessing
+import random
+import statistics
+import sys
+
+import pygame
+
+from alien_invasion import AlienInvasion
+from input_sources import PolicyInput, key_down, key_up
+from settings import Settings
+
+# Settings fixed when the game starts; set before it.
+STATIC_SETTINGS = ('difficulty_level',)
+# Settings the difficulty resets on every new game (from waves.json); set after it starts.
+DYNAMIC_SETTINGS = ('speedup_scale', 'score_scale', 'alien_speed', 'bullets_allowed',
+        'ship_speed', 'bullet_speed')
+
+
+class RandomPolicy:
+    """A class to play like a restless player: wander left and right, and shoot often."""
+
+    def __init__(self, seed, turn_chance=0.01, fire_chance=0.05):
+        """Initialize the bot with its own random number generator."""
+        self.random = random.Random(seed)
+        self.turn_chance = turn_chance
+        self.fire_chance = fire_chance
+        self.key = None # Arrow key currently held down.
+
+    def __call__(self, tick):
+        """Return this tick's key presses and releases."""
+        events = []
+        if self.key is None or self.random.random() < self.turn_chance:
+            if self.key is not None:
+                events.append(key_up(self.key))
+            self.key = self.random.choice((pygame.K_LEFT, pygame.K_RIGHT))
+            events.append(key_down(self.key))
+        if self.random.random() < self.fire_chance:
+            events.append(key_down(pygame.K_SPACE))
+        return events
+
+
+def idle_policy(tick):
+    """Never press anything; a baseline for how long the fleet takes to land."""
+    return ()
+
+
+POLICIES = {'random': RandomPolicy, 'idle': lambda seed: idle_policy}
+
+
+def play_game(job):
+    """Play one game to the end, or to max_ticks, and return how it went.
+
+    job is a dict holding the settings to use, 'seed', 'policy' and
+    'max_ticks'. The result repeats the settings and adds 'score',
+    'level' and 'ticks'.
+    """
+    params = job['params']
+    settings = Settings()
+    settings.skip_pauses = True # Nobody is watching, so don't wait after losing a ship.
+    for name in STATIC_SETTINGS:
+        if name in params:
+            setattr(settings, name, params[name])
+
+    policy = POLICIES[job['policy']](job['seed'])
+    ai_game = AlienInvasion(headless=True, input_source=PolicyInput(policy),
+            settings=settings)
+    ai_game._start_game()
+    for name in DYNAMIC_SETTINGS:
+        if name in params:
+            setattr(settings, name, params[name])
+    ai_game.bullets.resize(settings.bullets_allowed)
+
+    # One tick at a time, so ticks stops exactly where the game ended.
+    while ai_game.ticks < job['max_ticks'] and ai_game.step():
+        pass
+    return {'params': params, 'seed': job['seed'], 'score': ai_game.stats.score,
+            'level': ai_game.stats.level, 'ticks': ai_game.ticks,
+            'finished': not ai_game.stats.game_active}
+
+
+def make_jobs(grid, games, policy='random', max_ticks=120_000, seed=0):
+    """Return one job per game for every combination of the values in grid.
+
+    grid maps a setting name to the values to try. Games with the same
+    index use the same seed in every combination, so they're compared fairly.
+    """
+    names = list(grid)
+    jobs = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        params = dict(zip(names, values))
+        for game in range(games):
+            jobs.append({'params': params, 'seed': seed + game, 'policy': policy,
+                         'max_ticks': max_ticks})
+    return jobs
+
+
+def run(jobs, processes=None):
+    """Play every job across a pool of processes and return the results in job order."""
+    if processes == 1:
+        return [play_game(job) for job in jobs] # Easier to debug and profile in one process.
+    with multiprocessing.Pool(processes) as pool:
+        # Games take similar times, so hand them out in batches to save on messages.
+        chunksize = max(1, len(jobs) // (4 * (processes or multiprocessing.cpu_count())))
+        return pool.map(play_game, jobs, chunksize)
+
+
+def summarize(results):
+    """Group results by their settings and return one row of averages per group."""
+    groups = {}
+    for result in results:
+        key = tuple(sorted(result['params'].items()))
+        groups.setdefault(key, []).append(result)
+
+    rows = []
+    for key, group in groups.items():
+        scores = [result['score'] for result in group]
+        row = dict(key)
+        row.update({
+            'games': len(group),
+            'mean_score': statistics.fmean(scores),
+            'median_score': statistics.median(scores),
+            'max_score': max(scores),
+            'mean_level': statistics.fmean(result['level'] for result in group),
+            'mean_ticks': statistics.fmean(result['ticks'] for result in group),
+            'finished': sum(result['finished'] for result in group),
+        })
+        rows.append(row)
+    return rows
+
+
+def print_table(rows, file=sys.stdout):
+    """Print rows as a plain text table with aligned columns."""
+    if not rows:
+        return
+    columns = list(rows[0])
+    cells = [[_format(row[column]) for column in columns] for row in rows]
+    widths = [max(len(column), *(len(line[i]) for line in cells))
+              for i, column in enumerate(columns)]
+    print('  '.join(column.rjust(width) for column, width in zip(columns, widths)), file=file)
+    for line in cells:
+        print('  '.join(cell.rjust(width) for cell, width in zip(line, widths)), file=file)
+
+
+def _format(value):
+    """Show floats to one decimal place and everything else as is."""
+    return f'{value:.1f}' if isinstance(value, float) else str(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--difficulty', nargs='+', default=['medium'],
+            choices=['easy', 'medium', 'difficult'], dest='difficulty_level')
+    parser.add_argument('--speedup-scale', nargs='+', type=float)
+    parser.add_argument('--score-scale', nargs='+', type=float)
+    parser.add_argument('--alien-speed', nargs='+', type=float)
+    parser.add_argument('--bullets-allowed', nargs='+', type=int)
+    parser.add_argument('--games', type=int, default=20, help="games per combination")
+    parser.add_argument('--policy', choices=list(POLICIES), default='random')
+    parser.add_argument('--max-ticks', type=int, default=120_000,
+            help="stop games that last longer than this (default: about 17 minutes)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--processes', type=int,
+            help="worker processes (default: one per CPU)")
+    parser.add_argument('--csv', metavar='FILE', help="also write every game's result to FILE")
+    args = parser.parse_args()
+
+    grid = {name: getattr(args, name) for name in STATIC_SETTINGS + DYNAMIC_SETTINGS
+            if getattr(args, name, None)}
+    jobs = make_jobs(grid, args.games, args.policy, args.max_ticks, args.seed)
+    results = run(jobs, args.processes)
+    print_table(summarize(results))
+
+    if args.csv:
+        with open(args.csv, 'w', newline='') as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=list(grid) +
+                    ['seed', 'score', 'level', 'ticks', 'finished'])
+            writer.writeheader()
+            for result in results:
+                writer.writerow(dict(result['params'], seed=result['seed'],
+                        score=result['score'], level=result['level'],
+                        ticks=result['ticks'], finished=result['finished']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+from types import SimpleNamespace
+
+from particles import ParticleSystem
+from settings import Settings
+from viewport import Viewport
+
+
+def make_particles(max_particles):
+    settings = Settings()
+    settings.max_particles = max_particles
+    ai_game = SimpleNamespace(settings=settings, screen=None, headless=False,
+            view=Viewport((1200, 800), (1200, 800)))
+    return ParticleSystem(ai_game)
+
+
+def test_burst_bigger_than_budget_is_clamped():
+    particles = make_particles(20)
+    particles.burst((600, 400), 24)
+    assert particles.count == 20
+    assert particles.skipped == 4
+
+
+def test_burst_into_full_budget_is_skipped():
+    particles = make_particles(20)
+    particles.burst((600, 400), 24)
+    particles.burst((600, 400), 24)
+    assert particles.count == 20
+    assert particles.skipped == 28
+
+
+def test_no_budget_means_no_particles():
+    particles = make_particles(0)
+    particles.burst((600, 400))
+    assert particles.count == 0
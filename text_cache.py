@@ -0,0 +1,32 @@
+from collections import OrderedDict
+
+class TextCache:
+    """A class to render strings with one font and reuse the images.
+
+    The most recently used renders are kept, up to max_size of them, so text
+    that flips between a few values (a score, a level) is only drawn once.
+    """
+
+    def __init__(self, font, max_size=64):
+        """Initialize an empty cache for font."""
+        self.font = font
+        self.max_size = max_size
+        self._images = OrderedDict() # Oldest render first.
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, color, background=None):
+        """Return an antialiased image of text, rendering it only if it isn't cached."""
+        key = (text, color, background)
+        image = self._images.get(key)
+        if image is not None:
+            self.hits += 1
+            self._images.move_to_end(key)
+            return image
+
+        self.misses += 1
+        image = self.font.render(text, True, color, background)
+        self._images[key] = image
+        if len(self._images) > self.max_size:
+            self._images.popitem(last=False) # Forget the least recently used render.
+        return image
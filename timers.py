@@ -0,0 +1,48 @@
+class TimerService:
+    """A class to run callbacks after a delay, counted in game ticks.
+
+    Timers only advance when update() is called once per simulation tick, so
+    a pause never blocks the main loop: events keep being handled and the
+    screen keeps being drawn while it counts down. With fast_forward set,
+    timers fire as soon as they're started, for runs nobody is watching.
+    """
+
+    def __init__(self, tick_rate, fast_forward=False):
+        """Initialize a service with no timers running."""
+        self.tick_rate = tick_rate
+        self.fast_forward = fast_forward
+        self.timers = {} # Name -> [ticks left, callback].
+
+    def start(self, name, seconds, callback):
+        """Call callback after seconds of game time, replacing any timer called name."""
+        ticks = round(seconds * self.tick_rate)
+        if ticks <= 0 or self.fast_forward:
+            self.timers.pop(name, None)
+            callback()
+        else:
+            self.timers[name] = [ticks, callback]
+
+    def cancel(self, name):
+        """Stop the timer called name, if it's running."""
+        self.timers.pop(name, None)
+
+    def running(self, name):
+        """Return True if the timer called name hasn't fired yet."""
+        return name in self.timers
+
+    def update(self):
+        """Count every timer down by one tick and fire the ones that run out."""
+        if not self.timers:
+            return
+        expired = []
+        for name, timer in self.timers.items():
+            timer[0] -= 1
+            if timer[0] <= 0:
+                expired.append(name)
+        for name in expired:
+            callback = self.timers.pop(name)[1]
+            callback()
+
+    def clear(self):
+        """Stop every timer without firing it."""
+        self.timers.clear()
@@ -0,0 +1,52 @@
+import pygame
+
+def to_pixel(value):
+    """Round a coordinate the way assigning it to a pygame.Rect does (halves away from zero)."""
+    return int(value + 0.5) if value >= 0 else int(value - 0.5)
+
+
+class Viewport:
+    """A class to map the game's logical coordinates onto the display.
+
+    Everything in the game is laid out, moved and collided in a fixed
+    logical resolution, settings.screen_width by screen_height, whatever
+    the display is. The viewport scales that area to fill as much of the
+    display as it can without changing its shape, centred, with background
+    showing at the sides or top and bottom if the shapes differ.
+
+    Only drawing goes through the viewport. Images are scaled once per
+    display size by the image cache and text is rendered at a scaled font
+    size, so a frame only has to scale coordinates, never pixels.
+    """
+
+    def __init__(self, logical_size, display_size):
+        """Fit logical_size into display_size."""
+        logical_width, logical_height = logical_size
+        display_width, display_height = display_size
+        self.scale = min(display_width / logical_width, display_height / logical_height)
+        width, height = to_pixel(logical_width * self.scale), to_pixel(logical_height * self.scale)
+        # Where the play area sits on the display.
+        self.rect = pygame.Rect((display_width - width) // 2, (display_height - height) // 2,
+                width, height)
+        self.left, self.top = self.rect.topleft
+
+    def point(self, x, y):
+        """Return the display position of the logical point (x, y)."""
+        return (to_pixel(x * self.scale) + self.left, to_pixel(y * self.scale) + self.top)
+
+    def rect_of(self, x, y, width, height):
+        """Return the display rect covering the logical rect (x, y, width, height)."""
+        scale = self.scale
+        left, top = to_pixel(x * scale), to_pixel(y * scale)
+        # Scale both edges rather than the size, so neighbouring rects still meet.
+        return pygame.Rect(left + self.left, top + self.top,
+                max(1, to_pixel((x + width) * scale) - left),
+                max(1, to_pixel((y + height) * scale) - top))
+
+    def length(self, value):
+        """Return a logical length, such as a margin or font size, in display pixels."""
+        return max(1, to_pixel(value * self.scale))
+
+    def to_logical(self, pos):
+        """Return the logical point under the display position pos, e.g. a mouse click."""
+        return (int((pos[0] - self.left) // self.scale), int((pos[1] - self.top) // self.scale))
@@ -0,0 +1,98 @@
+import json
+
+import numpy as np
+
+class WaveBook:
+    """A class to hold the level definitions loaded from a waves file.
+
+    The file (waves.json) has three parts:
+      difficulties: the starting speeds, points, lives and bullets for each
+          difficulty, plus how fast speeds and points grow each level.
+      formations: named fleet layouts. A "grid" fills the screen like the
+          classic fleet, with optional spacing (in alien sizes), row and
+          column limits and a "checker" skip. A "pattern" is a list of rows
+          where X marks an alien, centred on the screen.
+      waves: the formation to use for each level in turn; the last one
+          repeats for every level after that.
+
+    Each formation's spawn coordinates are worked out once per screen and
+    alien size and kept, so starting a level only copies two arrays.
+    """
+
+    def __init__(self, data):
+        """Store the definitions from a parsed waves file."""
+        self.difficulties = data['difficulties']
+        self.formations = data['formations']
+        self.waves = data['waves']
+        for name in self.waves:
+            if name not in self.formations:
+                raise ValueError(f"wave uses unknown formation {name!r}")
+        self._layouts = {} # (formation, geometry) -> (xs, ys).
+
+    def difficulty(self, name):
+        """Return the starting settings for the named difficulty, as a dict."""
+        try:
+            return self.difficulties[name]
+        except KeyError:
+            raise ValueError(f"unknown difficulty {name!r}") from None
+
+    def formation_for(self, level):
+        """Return the name of the formation for level, counting from 1."""
+        return self.waves[min(level, len(self.waves)) - 1]
+
+    def layout(self, name, screen_size, alien_size, ship_height):
+        """Return the (xs, ys) spawn arrays for the named formation, computing them once."""
+        key = (name, screen_size, alien_size, ship_height)
+        layout = self._layouts.get(key)
+        if layout is None:
+            xs, ys = _build(self.formations[name], screen_size, alien_size, ship_height)
+            xs.setflags(write=False) # Shared between waves; Fleet.spawn() copies them.
+            ys.setflags(write=False)
+            layout = self._layouts[key] = (xs, ys)
+        return layout
+
+
+def _build(formation, screen_size, alien_size, ship_height):
+    """Work out the spawn coordinates of every alien in formation."""
+    screen_width, screen_height = screen_size
+    alien_width, alien_height = alien_size
+    if formation['shape'] == 'grid':
+        # Same sums as the classic fleet: a one-alien margin at the sides and
+        #   top, and room for three alien heights and the ship at the bottom.
+        column_step = formation.get('column_spacing', 2) * alien_width
+        row_step = formation.get('row_spacing', 2) * alien_height
+        number_aliens_x = int((screen_width - 2 * alien_width) // column_step)
+        number_rows = int((screen_height - 3 * alien_height - ship_height) // row_step)
+        number_aliens_x = min(number_aliens_x, formation.get('columns', number_aliens_x))
+        number_rows = min(number_rows, formation.get('rows', number_rows))
+
+        columns, rows = np.meshgrid(np.arange(number_aliens_x), np.arange(number_rows))
+        columns, rows = columns.ravel(), rows.ravel()
+        if formation.get('skip') == 'checker':
+            keep = (columns + rows) % 2 == 0
+            columns, rows = columns[keep], rows[keep]
+        return (alien_width + column_step * columns).astype(float), \
+               (alien_height + row_step * rows).astype(float)
+
+    if formation['shape'] == 'pattern':
+        pattern = formation['rows']
+        rows, columns = np.nonzero(np.array([[cell == 'X' for cell in row] for row in pattern]))
+        width = max(len(row) for row in pattern)
+        column_step = formation.get('column_spacing', 2) * alien_width
+        row_step = formation.get('row_spacing', 2) * alien_height
+        left = (screen_width - ((width - 1) * column_step + alien_width)) // 2
+        return (left + column_step * columns).astype(float), \
+               (alien_height + row_step * rows).astype(float)
+
+    raise ValueError(f"unknown formation shape {formation['shape']!r}")
+
+
+_books = {} # Path -> WaveBook, so each file is read once per process.
+
+def load(path):
+    """Return the WaveBook for the waves file at path, reading it on first use."""
+    book = _books.get(path)
+    if book is None:
+        with open(path) as waves_file:
+            book = _books[path] = WaveBook(json.load(waves_file))
+    return book